@@ -0,0 +1,27 @@
+"""Record model and prompt version on article summaries for the summary cache
+
+Revision ID: 104783887bde
+Revises:
+Create Date: 2026-10-17 09:12:40.118204
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '104783887bde'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: databases created by init_db() already have these columns
+    op.execute("ALTER TABLE article_summaries ADD COLUMN IF NOT EXISTS model TEXT")
+    op.execute("ALTER TABLE article_summaries ADD COLUMN IF NOT EXISTS prompt_version INTEGER")
+
+
+def downgrade() -> None:
+    op.drop_column('article_summaries', 'prompt_version')
+    op.drop_column('article_summaries', 'model')
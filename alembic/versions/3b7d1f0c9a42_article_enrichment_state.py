@@ -0,0 +1,43 @@
+"""Per-article enrichment state (needs_summary / needs_tags / retry cool-down)
+
+Revision ID: 3b7d1f0c9a42
+Revises: 9e2f4b6a8c13
+Create Date: 2026-10-17 13:05:18.402671
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7d1f0c9a42'
+down_revision: Union[str, None] = '9e2f4b6a8c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE articles ADD COLUMN IF NOT EXISTS needs_summary BOOLEAN NOT NULL DEFAULT true")
+    op.execute("ALTER TABLE articles ADD COLUMN IF NOT EXISTS needs_tags BOOLEAN NOT NULL DEFAULT true")
+    op.execute("ALTER TABLE articles ADD COLUMN IF NOT EXISTS enrich_attempts INTEGER NOT NULL DEFAULT 0")
+    op.execute("ALTER TABLE articles ADD COLUMN IF NOT EXISTS next_attempt_at TIMESTAMPTZ")
+    # Seed from what exists today: pending only if there's no usable summary / no live tag
+    op.execute("""
+        UPDATE articles a SET
+            needs_summary = NOT EXISTS (SELECT 1 FROM article_summaries s
+                                        WHERE s.article_id = a.id AND coalesce(s.subtitle, '') <> ''),
+            needs_tags = NOT EXISTS (SELECT 1 FROM article_tags t
+                                     WHERE t.article_id = a.id AND NOT t.removed)
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_articles_needs_summary "
+               "ON articles (next_attempt_at) WHERE needs_summary")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_articles_needs_tags ON articles (id) WHERE needs_tags")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_articles_needs_tags")
+    op.execute("DROP INDEX IF EXISTS idx_articles_needs_summary")
+    op.drop_column('articles', 'next_attempt_at')
+    op.drop_column('articles', 'enrich_attempts')
+    op.drop_column('articles', 'needs_tags')
+    op.drop_column('articles', 'needs_summary')
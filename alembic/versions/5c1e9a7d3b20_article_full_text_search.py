@@ -0,0 +1,40 @@
+"""Full-text + trigram search on articles
+
+Revision ID: 5c1e9a7d3b20
+Revises: 104783887bde
+Create Date: 2026-10-17 10:03:15.402871
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from newsfeed.storage.models import SEARCH_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9a7d3b20'
+down_revision: Union[str, None] = '104783887bde'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector")
+    for statement in SEARCH_DDL:
+        op.execute(statement)
+    # Backfill existing rows before indexing
+    op.execute("UPDATE articles SET search_vector = article_search_document(id, title, content)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_articles_search_vector ON articles USING gin (search_vector)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_articles_title_trgm ON articles USING gin (title gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_article_summaries_search_vector ON article_summaries")
+    op.execute("DROP TRIGGER IF EXISTS trg_articles_search_vector ON articles")
+    op.execute("DROP FUNCTION IF EXISTS article_summaries_search_vector_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS articles_search_vector_trigger()")
+    op.execute("DROP INDEX IF EXISTS idx_articles_title_trgm")
+    op.drop_index('idx_articles_search_vector', table_name='articles')
+    op.drop_column('articles', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS article_search_document(integer, text, text)")
+    op.execute("DROP FUNCTION IF EXISTS article_summary_text(integer)")
@@ -0,0 +1,44 @@
+"""Jobs queue table
+
+Revision ID: 7a4c2e9d1f05
+Revises: 3b7d1f0c9a42
+Create Date: 2026-10-17 15:42:07.118305
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a4c2e9d1f05'
+down_revision: Union[str, None] = '3b7d1f0c9a42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id SERIAL PRIMARY KEY,
+            kind TEXT NOT NULL,
+            params JSONB NOT NULL DEFAULT '{}'::jsonb,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 1,
+            run_after TIMESTAMPTZ NOT NULL DEFAULT now(),
+            locked_by TEXT,
+            heartbeat_at TIMESTAMPTZ,
+            result JSONB,
+            error TEXT,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            started_at TIMESTAMPTZ,
+            finished_at TIMESTAMPTZ,
+            CONSTRAINT ck_jobs_status CHECK (status IN ('queued', 'running', 'done', 'failed'))
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs (run_after, id) WHERE status = 'queued'")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_jobs_running ON jobs (heartbeat_at) WHERE status = 'running'")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS jobs")
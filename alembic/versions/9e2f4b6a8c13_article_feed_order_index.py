@@ -0,0 +1,25 @@
+"""Composite (date, id) index for keyset pagination of the feed
+
+Revision ID: 9e2f4b6a8c13
+Revises: 5c1e9a7d3b20
+Create Date: 2026-10-17 10:41:52.730114
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2f4b6a8c13'
+down_revision: Union[str, None] = '5c1e9a7d3b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE INDEX IF NOT EXISTS idx_articles_feed_order "
+               "ON articles (coalesce(date, DATE '0001-01-01'), id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_articles_feed_order")
@@ -0,0 +1,36 @@
+"""Category summary parts (resumable map/reduce progress)
+
+Revision ID: c81f3e6a2d94
+Revises: 7a4c2e9d1f05
+Create Date: 2026-10-17 17:20:44.903517
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f3e6a2d94'
+down_revision: Union[str, None] = '7a4c2e9d1f05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS category_summary_parts (
+            id SERIAL PRIMARY KEY,
+            tag_id INTEGER NOT NULL REFERENCES tags (id) ON DELETE CASCADE,
+            date_from DATE NOT NULL,
+            date_to DATE NOT NULL,
+            node_key TEXT NOT NULL,
+            level INTEGER NOT NULL,
+            summary TEXT NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT uq_category_summary_parts UNIQUE (tag_id, date_from, date_to, node_key)
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS category_summary_parts")
@@ -0,0 +1,135 @@
+"""Cleanup pipeline: golden-output check and throughput benchmark.
+
+    python benchmarks/cleanup.py            # verify goldens, then time per-tool vs fused
+    python benchmarks/cleanup.py --update   # regenerate goldens from the per-tool path
+
+Each corpus/cleanup/*.md is a raw Jina Reader response; its .golden.json holds
+the expected article fields after the DCD cleaning steps. The per-tool path runs
+the text transforms as they were before fusion (LEGACY below), so a passing
+check proves the fused pipeline produces identical output.
+"""
+import os, re, sys, html, json, time, argparse
+from pathlib import Path
+
+# Add project root to path so we can import newsfeed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newsfeed.config import load_site_config
+from newsfeed.processing import process_article, TOOLS
+from newsfeed.processing.cleanup import TEXT_TRANSFORMS
+from newsfeed.processing.orchestrator import compile_pipeline
+
+CORPUS = Path(__file__).parent / "corpus" / "cleanup"
+FIELDS = ("title", "jina_title", "jina_url", "content")
+LLM_TOOLS = {"summarize", "auto_tag"}
+
+# Text transforms as implemented before fusion: one tool per step, ad hoc regexes.
+LEGACY = {
+    "strip_byline": lambda text: re.sub(
+        r'^(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\s+By.+$',
+        '', text, count=1, flags=re.MULTILINE),
+    "strip_links": lambda text: re.sub(r'\[([^\]]*)\]\([^)]+\)', r'\1', text),
+    "strip_images": lambda text: re.sub(r'^–\s+.{1,30}$', '', re.sub(r'!\[[^\]]*\]\([^)]+\)', '', text),
+                                        flags=re.MULTILINE),
+    "decode_entities": html.unescape,
+    "normalize_whitespace": lambda text: re.sub(r'[ \t]+$', '', re.sub(r'\n{3,}', '\n\n', text),
+                                                flags=re.MULTILINE).strip(),
+}
+
+
+def legacy_tool(article: dict, config, name: str) -> dict:
+    article["content"] = LEGACY[name](article["content"])
+    if name == "decode_entities":
+        article["title"] = html.unescape(article.get("title", ""))
+    return article
+
+
+def cleaning_config():
+    config = load_site_config("dcd")
+    config.pipeline = [t for t in config.pipeline if t not in LLM_TOOLS]
+    return config
+
+
+def run_per_tool(raw: str, config) -> dict:
+    """Reference path: every tool in turn, legacy text transforms, no fusion."""
+    article = {"content": raw, "title": ""}
+    for name in config.pipeline:
+        article = legacy_tool(article, config, name) if name in LEGACY else TOOLS[name](article, config)
+    return article
+
+
+def run_fused(raw: str, config) -> dict:
+    return process_article({"content": raw, "title": ""}, config)
+
+
+def check_goldens(config, update: bool) -> bool:
+    ok = True
+    for path in sorted(CORPUS.glob("*.md")):
+        raw = path.read_text()
+        golden_path = path.with_suffix(".golden.json")
+        reference = {k: run_per_tool(raw, config).get(k) for k in FIELDS}
+        if update:
+            golden_path.write_text(json.dumps(reference, indent=2, ensure_ascii=False) + "\n")
+            print(f"updated  {golden_path.name}")
+            continue
+        golden = json.loads(golden_path.read_text())
+        fused = {k: run_fused(raw, config).get(k) for k in FIELDS}
+        for label, got in (("per-tool", reference), ("fused", fused)):
+            if got != golden:
+                ok = False
+                print(f"MISMATCH {path.name} ({label})")
+        if reference == golden == fused:
+            print(f"ok       {path.name}")
+    return ok
+
+
+def bench(fn, docs, rounds: int) -> float:
+    """Throughput in MB/s over `rounds` passes of `docs`."""
+    size = sum(len(d) for d in docs) * rounds
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for d in docs:
+            fn(d)
+    return size / (time.perf_counter() - start) / 1e6
+
+
+def bench_text_run(config, docs, rounds: int) -> dict:
+    """Per-tool vs fused over the pipeline's run of text transforms only."""
+    names = [t for t in config.pipeline if t in TEXT_TRANSFORMS]
+    fused = next(step for step in compile_pipeline(config.pipeline) if step not in TOOLS.values())
+    bodies = [TOOLS["extract_jina_meta"]({"content": d}, config)["content"] for d in docs]
+    bodies.append("\n\n".join(bodies[:-1] * 100))
+
+    def per_tool(body):
+        article = {"content": body, "title": ""}
+        for name in names:
+            article = legacy_tool(article, config, name)
+
+    per_tool_mb_s = bench(per_tool, bodies, rounds)
+    fused_mb_s = bench(lambda body: fused({"content": body, "title": ""}, config), bodies, rounds)
+    return {"steps": names, "per_tool_mb_s": round(per_tool_mb_s, 2),
+            "fused_mb_s": round(fused_mb_s, 2), "speedup": round(fused_mb_s / per_tool_mb_s, 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--update", action="store_true", help="rewrite golden outputs")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    config = cleaning_config()
+    if not check_goldens(config, args.update):
+        sys.exit(1)
+    if args.update:
+        return
+
+    docs = [p.read_text() for p in sorted(CORPUS.glob("*.md"))]
+    docs.append(docs[0] + "\n\n".join(docs[0].split("Markdown Content:", 1)[1] for _ in range(50)))
+    pipeline = {"per_tool_mb_s": round(bench(lambda d: run_per_tool(d, config), docs, args.rounds), 2),
+                "fused_mb_s": round(bench(lambda d: run_fused(d, config), docs, args.rounds), 2)}
+    print(json.dumps({"pipeline": pipeline, "text_transforms": bench_text_run(config, docs, args.rounds)},
+                     indent=2))
+
+
+if __name__ == "__main__":
+    main()
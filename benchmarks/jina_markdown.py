@@ -0,0 +1,103 @@
+"""Synthetic Jina Reader markdown, shaped like the DCD pages the pipeline sees.
+
+Articles carry the Jina header, a nav menu, link clusters, a cookie banner, a
+share row, a lead-gen form, the byline, images with captions, a linked body of
+the requested size and a footer. Listings match the DCD listing_pattern.
+Output is deterministic for a given seed.
+"""
+import random
+from datetime import date, timedelta
+
+WORDS = ("data center campus capacity hyperscale operator power grid cooling liquid rack GPU cluster "
+         "megawatt expansion acquisition investment fiber latency colocation tenant lease region "
+         "sustainability renewable substation permit construction developer partnership quarter "
+         "revenue AI inference training network edge subsea cable interconnection").split()
+SECTIONS = ("News", "Analysis", "Opinion", "Podcasts", "Events", "Awards", "Jobs", "Whitepapers")
+COMPANIES = ("Equinix", "Digital Realty", "NTT", "CyrusOne", "Vantage", "QTS", "Iron Mountain", "Start Campus")
+MONTHS = ("January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December")
+BASE = "https://www.datacenterdynamics.com/en"
+
+
+def _sentence(rng: random.Random, link_rate: float = 0.08) -> str:
+    words = []
+    for _ in range(rng.randint(12, 28)):
+        w = rng.choice(WORDS)
+        if rng.random() < link_rate:
+            w = f"[{w}]({BASE}/news/{w}-{rng.randint(1, 9999)}/)"
+        words.append(w)
+    if rng.random() < 0.2: words.insert(0, rng.choice(COMPANIES) + " &amp; partners")
+    return " ".join(words).capitalize() + "."
+
+
+def nav_block(rng: random.Random, items: int = 8) -> str:
+    return "\n".join(f"*   [{s}]({BASE}/{s.lower()}/)" for s in rng.sample(SECTIONS, min(items, len(SECTIONS))))
+
+
+def link_cluster(rng: random.Random, links: int = 6) -> str:
+    return "\n".join(f"[{rng.choice(WORDS).title()} {rng.choice(WORDS)}]({BASE}/news/{rng.randint(1, 99999)}/)"
+                     for _ in range(links))
+
+
+def cookie_banner() -> str:
+    return ("We use cookies to improve your experience. By continuing you consent to our privacy policy.\n"
+            "[Accept all cookies](#) [Manage preferences](#)")
+
+
+def share_row() -> str:
+    return ("[Facebook](https://facebook.com/share) [Twitter](https://twitter.com/share) "
+            "[LinkedIn](https://linkedin.com/share) [Email](mailto:)")
+
+
+def lead_form() -> str:
+    return "Nome*\n\nEmail*\n\nTelefone*\n\n(+351)\n\n- [ ] Aceito a política de privacidade\n\nSubmit"
+
+
+def body(rng: random.Random, size: int) -> str:
+    """Paragraphs (with the odd image, caption and blank-line run) totalling about `size` chars."""
+    parts, total = [], 0
+    while total < size:
+        para = " ".join(_sentence(rng) for _ in range(rng.randint(2, 5))) + rng.choice(("", "   ", "\t"))
+        if rng.random() < 0.1:
+            para += f"\n![Image {rng.randint(1, 50)}: rendering]({BASE}/media/{rng.randint(1, 999)}.jpg)\n– {rng.choice(COMPANIES)}"
+        parts.append(para)
+        total += len(para)
+    return ("\n\n" + "\n" * (rng.random() < 0.2)).join(parts)
+
+
+def article(size: int = 8_000, seed: int = 0, nav_blocks: int = 2, link_clusters: int = 2,
+            cookie_banners: int = 1) -> str:
+    """One raw Jina response for an article whose body is about `size` chars."""
+    rng = random.Random(seed)
+    day = date(2026, 1, 1) + timedelta(days=rng.randint(0, 300))
+    title = f"{rng.choice(COMPANIES)} plans {rng.randint(10, 400)}MW {rng.choice(WORDS)} campus"
+    head = [f"Title: {title}", f"URL Source: {BASE}/news/{seed}/", f"Published Time: {day.isoformat()}T09:00:00+00:00",
+            "", "Markdown Content:"]
+    noise = [nav_block(rng) for _ in range(nav_blocks)] + [link_cluster(rng) for _ in range(link_clusters)]
+    noise += [cookie_banner() for _ in range(cookie_banners)]
+    byline = f"{MONTHS[day.month - 1]} {day.day}, {day.year} By{rng.choice(('Dan Swinhoe', 'Zachary Skidmore'))}Have your say"
+    footer = ["More in Construction", link_cluster(rng, 4), "Subscribe to our newsletter", lead_form()]
+    sections = noise[:len(noise) // 2] + [byline, share_row(), body(rng, size)] + footer + noise[len(noise) // 2:]
+    return "\n".join(head) + "\n" + "\n\n".join(sections) + "\n"
+
+
+def listing(items: int = 20, seed: int = 0, start: date = date(2026, 10, 15)) -> str:
+    """One raw listing page with `items` entries, newest first."""
+    rng = random.Random(seed)
+    entries = [nav_block(rng)]
+    for i in range(items):
+        day = start - timedelta(days=i // 3)
+        slug = f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{seed}-{i}"
+        entries.append(f"*   ![Image {i}: {slug}]({BASE}/media/{slug}.jpg){day.day} {day:%b} {day.year}   "
+                       f"[{slug.replace('-', ' ').title()}]({BASE}/news/{slug}/)\n"
+                       f"{'=' * 20}\n\n{_sentence(rng, 0)}")
+    entries.append(cookie_banner())
+    return "\n\n".join(entries) + "\n"
+
+
+def llm_response(seed: int = 0, fenced: bool = True) -> str:
+    """A Gemma-style summary reply: JSON, optionally in a fence with chatter around it."""
+    rng = random.Random(seed)
+    payload = ('{\n  "subtitle": "' + _sentence(rng, 0)[:90] + '",\n  "bullets": [\n'
+               + ",\n".join(f'    "{_sentence(rng, 0)}"' for _ in range(rng.randint(3, 5))) + "\n  ]\n}")
+    return f"Here is the summary:\n```json\n{payload}\n```\n" if fenced else payload
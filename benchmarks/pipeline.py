@@ -0,0 +1,67 @@
+"""End-to-end fetch → process throughput from recorded fixtures (no network).
+
+    NEWSFEED_FIXTURES=record python -m newsfeed.run --site dcd   # once, with network + API key
+    python benchmarks/pipeline.py --site dcd --from 2026-02-01 --jina-latency 0.8 --llm-latency 2.5
+
+Replays r.jina.ai and Gemini from the fixture store (see newsfeed/fixtures.py)
+through the real fetch, rate-limit, processing and cost-tracking code, with the
+given latency injected per call. Saving is not included. Prints JSON.
+"""
+import os, sys, json, time, logging, argparse, tracemalloc
+
+# Add project root to path so we can import newsfeed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["NEWSFEED_FIXTURES"] = "replay"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--site", default="dcd")
+    parser.add_argument("--from", dest="from_date", required=True, help="same range as the recording")
+    parser.add_argument("--to", dest="to_date", default=None)
+    parser.add_argument("--max-pages", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=None, help="process workers (default: site config)")
+    parser.add_argument("--jina-latency", type=float, default=0.0, help="seconds per replayed Jina call")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds per replayed Gemini call")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    from newsfeed import fixtures
+    fixtures.LATENCY.update(jina=args.jina_latency, llm=args.llm_latency)
+    from newsfeed.config import load_site_config, SiteState
+    from newsfeed.fetch import fetch_new_articles
+    from newsfeed.pipeline import process_concurrently
+    from newsfeed.cost import get_daily_cost, reset_daily_usage
+
+    config = load_site_config(args.site)
+    config.cache_listings = False
+    config.request_delay = 0  # the injected latency stands in for the network
+    workers = args.workers or config.process_workers
+    reset_daily_usage()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    first_at, count, summarized = None, 0, 0
+    articles = fetch_new_articles(config, SiteState(name=config.name), args.from_date, args.to_date, args.max_pages)
+    for article in process_concurrently(articles, config, workers):
+        if first_at is None: first_at = time.perf_counter() - start
+        count += 1
+        summarized += bool(article.get("subtitle"))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(json.dumps({
+        "site": args.site, "workers": workers,
+        "latency_s": {"jina": args.jina_latency, "llm": args.llm_latency},
+        "articles": count, "summarized": summarized,
+        "elapsed_s": round(elapsed, 3),
+        "first_article_s": round(first_at or 0, 3),
+        "articles_per_s": round(count / elapsed, 2) if elapsed else None,
+        "peak_mem_mb": round(peak / 1e6, 2),
+        "cost": get_daily_cost(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Per-stage throughput and memory for the processing hot paths, as JSON.
+
+    python benchmarks/stages.py                         # default sizes
+    python benchmarks/stages.py --sizes 2000 20000 200000 --out before.json
+    python benchmarks/stages.py --save                  # also time save_articles (writes to DATABASE_URL)
+
+Inputs come from benchmarks/jina_markdown.py, so runs are reproducible. Each stage
+reports MB/s (or items/s) over --rounds passes and the peak memory tracemalloc
+sees during one pass; diff two --out files to spot regressions between versions.
+"""
+import os, sys, json, time, uuid, random, logging, argparse, platform, subprocess, tracemalloc
+
+# Add project root to path so we can import newsfeed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jina_markdown as gen
+from newsfeed.config import load_site_config
+from newsfeed.fetch.parser import parse_listing
+from newsfeed.processing import process_article
+from newsfeed.processing.noise import remove_noise
+from newsfeed.processing.extraction import extract_jina_meta, extract_body_by_markers, extract_body_by_heuristic
+from newsfeed.processing.cleanup import TEXT_TRANSFORMS, fuse_transforms
+from newsfeed.processing.tagging import auto_tag
+from newsfeed.processing.summarization import extract_json
+
+LLM_TOOLS = {"summarize", "auto_tag"}
+
+
+def measure(fn, inputs: list, rounds: int) -> dict:
+    """Throughput of fn over `inputs` (MB/s of input text, items/s) and peak memory of one pass."""
+    size = sum(len(x) for x in inputs)
+    tracemalloc.start()
+    for x in inputs: fn(x)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for x in inputs: fn(x)
+    elapsed = time.perf_counter() - start
+    return {"mb_s": round(size * rounds / elapsed / 1e6, 2),
+            "items_s": round(len(inputs) * rounds / elapsed, 1),
+            "peak_kb": round(peak / 1024, 1)}
+
+
+def text_stages(config, docs: list[str], rounds: int) -> dict:
+    bodies = [extract_jina_meta(d)["body"] for d in docs]
+    denoised = [remove_noise(b, config.noise_patterns) for b in bodies]
+    extracted = [extract_body_by_markers(b, config.content_start, config.content_end) for b in denoised]
+    cleaning = [t for t in config.pipeline if t not in LLM_TOOLS]
+    stages = {
+        "extract_jina_meta": measure(extract_jina_meta, docs, rounds),
+        "remove_noise": measure(lambda b: remove_noise(b, config.noise_patterns), bodies, rounds),
+        "extract_body_by_markers": measure(
+            lambda b: extract_body_by_markers(b, config.content_start, config.content_end), denoised, rounds),
+        "extract_body_by_heuristic": measure(extract_body_by_heuristic, denoised, rounds),
+    }
+    for name, transform in TEXT_TRANSFORMS.items():
+        stages[name] = measure(transform, extracted, rounds)
+    names = [t for t in cleaning if t in TEXT_TRANSFORMS]
+    stages["text_transforms_fused"] = measure(fuse_transforms(names), extracted, rounds)
+    stages["auto_tag"] = measure(auto_tag, extracted, rounds)
+    stages["process_article_cleaning"] = measure(
+        lambda d: process_article({"content": d, "title": ""}, config, pipeline=cleaning), docs, rounds)
+    return stages
+
+
+def save_stage(batches: int, batch_size: int) -> dict:
+    """save_articles into DATABASE_URL under a throwaway source, removed afterwards."""
+    from newsfeed.storage.database import get_session
+    from newsfeed.storage.models import Article, Source
+    from newsfeed.storage.repository import save_articles
+    source = f"benchmark-{uuid.uuid4().hex[:8]}"
+    rows = [[{"url": f"https://bench.invalid/{source}/{b}/{i}", "title": f"Bench {i}", "date": "2026-10-01",
+              "content": gen.body(random.Random(i), 4000), "subtitle": "s", "bullets": ["a", "b", "c"],
+              "tags": ["ai"], "summary_model": "bench", "prompt_version": 1}
+             for i in range(batch_size)] for b in range(batches)]
+    db = get_session()
+    try:
+        start = time.perf_counter()
+        for batch in rows: save_articles(batch, source, "https://bench.invalid/", db=db)
+        elapsed = time.perf_counter() - start
+        return {"items_s": round(batches * batch_size / elapsed, 1), "batch_size": batch_size}
+    finally:
+        src = db.query(Source).filter_by(name=source).first()
+        if src:
+            db.query(Article).filter_by(source_id=src.id).delete()
+            db.delete(src)
+            db.commit()
+        db.close()
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 20_000, 200_000],
+                        help="article body sizes in chars")
+    parser.add_argument("--docs", type=int, default=20, help="documents per size")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--listing-items", type=int, default=30)
+    parser.add_argument("--save", action="store_true", help="also benchmark save_articles (needs DATABASE_URL)")
+    parser.add_argument("--out", help="write results here as well as stdout")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    config = load_site_config("dcd")
+    results = {"revision": git_revision(), "python": platform.python_version(),
+               "docs": args.docs, "rounds": args.rounds, "stages": {}}
+    for size in args.sizes:
+        docs = [gen.article(size=size, seed=s) for s in range(args.docs)]
+        results["stages"][f"article_{size}"] = text_stages(config, docs, args.rounds)
+
+    listings = [gen.listing(args.listing_items, seed=s) for s in range(args.docs)]
+    replies = [gen.llm_response(seed=s, fenced=s % 2 == 0) for s in range(args.docs)]
+    results["stages"]["listing"] = {"parse_listing": measure(lambda md: parse_listing(md, config), listings,
+                                                             args.rounds)}
+    results["stages"]["llm_reply"] = {"extract_json": measure(extract_json, replies, args.rounds * 20)}
+    if args.save:
+        results["stages"]["storage"] = {"save_articles": save_stage(batches=4, batch_size=50)}
+
+    out = json.dumps(results, indent=2)
+    print(out)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(out + "\n")
+
+
+if __name__ == "__main__":
+    main()
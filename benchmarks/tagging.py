@@ -0,0 +1,76 @@
+"""Tagger recall check against the original substring matcher.
+
+    python benchmarks/tagging.py
+
+The original auto_tag tagged a text when any keyword of the original
+taxonomy (BASELINE) occurred anywhere in it as a substring, so plurals matched
+for free. For every baseline keyword this builds a sentence with the word as-is
+and pluralized, plus SENTENCES below, and reports each text the substring
+matcher tagged that the current tagger (tags.json) does not. Exits non-zero on
+any miss. Mid-word hits the boundary rule drops on purpose ("ran" in
+"guarantee") are not generated, so they are not reported.
+"""
+import os, sys, logging
+
+# Add project root to path so we can import newsfeed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from newsfeed.processing.tagging import auto_tag
+
+# tags.json before the word-boundary tagger
+BASELINE = {
+    "Expansion": ["new build", "campus", "expansion", "develop", "construction", "groundbreaking", "planned"],
+    "Acquisition": ["acquire", "acquisition", "merger", "takeover", "stake", "buyout"],
+    "Partnership": ["partner", "partnership", "collaboration", "deal", "agreement", "signs", "contract"],
+    "Funding": ["funding", "raises", "investment", "series a", "series b", "ipo", "debt", "financing"],
+    "Solar": ["solar", "ppa", "renewables", "clean energy", "wind"],
+    "AI": ["artificial intelligence", "ai ", "gpu", "inference", "machine learning"],
+    "Colocation": ["colocation", "colo", "wholesale"],
+    "Edge": ["edge computing", "edge data center", "low-latency"],
+    "Submarine Cable": ["subsea", "submarine cable", "fiber cable"],
+    "Regulatory": ["moratorium", "tax credit", "regulation", "governor", "legislation", "pause"],
+    "Sustainability": ["carbon", "emissions", "water", "cooling", "waste heat", "energy storage"],
+    "Quantum": ["quantum computing", "quantum computer", "qubit"],
+    "Telecom": ["5g", "4g", "lte", "carrier", "telco", "telecom", "ran", "spectrum"],
+}
+SENTENCES = [
+    "Investments in new campuses were announced.",
+    "Mergers and acquisitions slowed this quarter.",
+    "Telcos and carriers are upgrading networks.",
+    "New regulations hit the sector.",
+    "The firm raises $200m in financing.",
+    "Governors debated moratoriums on data centers.",
+    "The developer is expanding its GPUs for inference.",
+]
+
+
+def baseline_tag(text: str) -> set[str]:
+    """The original matcher: any baseline keyword as a substring."""
+    text = text.lower()
+    return {tag for tag, kws in BASELINE.items() if any(kw in text for kw in kws)}
+
+
+def plural(word: str) -> str:
+    if word.endswith("s"): return word
+    return word + ("es" if word.endswith(("x", "ch", "sh")) else "s")
+
+
+def main():
+    logging.disable(logging.INFO)
+    texts = list(SENTENCES)
+    for kws in BASELINE.values():
+        for kw in (kw.strip() for kw in kws):
+            texts += [f"Report: {kw} announced.", f"Report: {plural(kw)} announced."]
+
+    missed = []
+    for text in texts:
+        lost = baseline_tag(text) - set(auto_tag(text))
+        if lost: missed.append((text, sorted(lost)))
+    for text, lost in missed:
+        print(f"MISSED {lost}: {text}")
+    print(f"{len(texts) - len(missed)}/{len(texts)} texts keep every baseline tag")
+    sys.exit(1 if missed else 0)
+
+
+if __name__ == "__main__":
+    main()
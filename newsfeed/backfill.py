@@ -1,37 +1,75 @@
-"""Backfill missing summaries and tags for existing articles."""
+"""Backfill missing summaries and tags for existing articles.
 
-import logging
+    python -m newsfeed.backfill [--limit N] [--since YYYY-MM-DD] [--concurrency N]
+
+Candidates are read in keyset batches of BATCH_SIZE (never all at once); each
+batch is summarized on a bounded worker pool and committed in one transaction.
+"""
+
+import argparse, contextvars, logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterator, Optional
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
 from newsfeed.storage.database import get_session
-from newsfeed.storage.models import Article, ArticleSummary, ArticleTag, Tag
-from newsfeed.storage.repository import _get_or_create_tag
-from newsfeed.processing.summarization import summarize
+from newsfeed.storage.models import Article, ArticleSummary, ArticleTag
+from newsfeed.storage.repository import _resolve_tags
+from newsfeed.processing.summarization import summarize, SUMMARY_PROMPT_VERSION
 from newsfeed.processing.tagging import auto_tag
 from newsfeed.processing import process_article
-from newsfeed.config import SiteConfig
-from newsfeed.fetch.client import jina_fetch
-import httpx
+from newsfeed.config import SiteConfig, DEFAULT_MODEL
+from newsfeed.fetch.client import make_client, jina_fetch
 
 log = logging.getLogger("newsfeed.backfill")
 
+BATCH_SIZE = 50
+DEFAULT_CONCURRENCY = 4
+
+MAX_SUMMARY_ATTEMPTS = 5
+RETRY_BASE = timedelta(hours=1)   # cool-down after the first failure, doubled after each further one
+RETRY_MAX = timedelta(days=7)
+
+
+def get_articles_missing_summaries(session, since: Optional[date] = None):
+    """Query for articles still needing a summary whose retry cool-down has passed (and attempts remain)."""
+    q = (session.query(Article)
+         .options(load_only(Article.id, Article.url, Article.title, Article.content,
+                            Article.enrich_attempts))
+         .filter(Article.needs_summary,
+                 Article.enrich_attempts < MAX_SUMMARY_ATTEMPTS,
+                 or_(Article.next_attempt_at == None, Article.next_attempt_at <= datetime.now(timezone.utc))))
+    return q.filter(Article.date >= since) if since else q
 
-def get_articles_missing_summaries(session):
-    """Find articles that have no summary or empty subtitle."""
-    return (session.query(Article)
-            .outerjoin(ArticleSummary)
-            .filter(
-                (ArticleSummary.id == None) |
-                (ArticleSummary.subtitle == None) |
-                (ArticleSummary.subtitle == '')
-            )
-            .all())
 
+def get_articles_missing_tags(session, since: Optional[date] = None):
+    """Query for articles that have never been auto-tagged."""
+    q = (session.query(Article)
+         .options(load_only(Article.id, Article.title, Article.content))
+         .filter(Article.needs_tags))
+    return q.filter(Article.date >= since) if since else q
 
-def get_articles_missing_tags(session):
-    """Find articles that have no tags."""
-    return (session.query(Article)
-            .outerjoin(ArticleTag, (ArticleTag.article_id == Article.id) & (ArticleTag.removed == False))
-            .filter(ArticleTag.id == None)
-            .all())
+
+def iter_batches(query, limit: Optional[int] = None, batch_size: int = BATCH_SIZE) -> Iterator[list]:
+    """Keyset pages of `query` by id, so memory is bounded and per-batch commits are safe."""
+    after, remaining = 0, limit
+    while remaining is None or remaining > 0:
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        batch = query.filter(Article.id > after).order_by(Article.id).limit(size).all()
+        if not batch: return
+        after = batch[-1].id  # read before the caller commits and expires the batch
+        if remaining is not None: remaining -= len(batch)
+        yield batch
+
+
+def record_failed_attempt(article):
+    """Count a failed summary attempt and push the next one out exponentially."""
+    article.enrich_attempts = (article.enrich_attempts or 0) + 1
+    delay = min(RETRY_BASE * 2 ** (article.enrich_attempts - 1), RETRY_MAX)
+    article.next_attempt_at = datetime.now(timezone.utc) + delay
+    if article.enrich_attempts >= MAX_SUMMARY_ATTEMPTS:
+        log.warning(f"Article {article.id}: giving up on summary after {article.enrich_attempts} attempts")
 
 
 CLEANING_PIPELINE = [
@@ -40,118 +78,152 @@ CLEANING_PIPELINE = [
     "decode_entities", "normalize_whitespace",
 ]
 
-def refetch_content(article):
+# Refetches share one pooled client; max_concurrency sizes both the pool and the
+# number of refetches in flight, request_delay feeds the per-host rate limiter.
+REFETCH_CONFIG = SiteConfig(name="backfill", listing_url="", pagination="", max_concurrency=8)
+
+def refetch_content(client, article_id: int, url: str, title: str, config: SiteConfig = REFETCH_CONFIG) -> Optional[str]:
     """Re-fetch and clean content for an article missing content."""
-    if not article.url:
-        log.warning(f"Article {article.id} has no URL — cannot refetch")
+    if not url:
+        log.warning(f"Article {article_id} has no URL — cannot refetch")
         return None
     try:
-        transport = httpx.HTTPTransport(retries=3, verify=True)
-        client = httpx.Client(transport=transport, timeout=30)
-        raw = jina_fetch(client, article.url)
-        client.close()
+        raw = jina_fetch(client, url, config.request_delay)
 
         # Use the processing pipeline (without summarize/auto_tag)
-        article_dict = {"content": raw, "url": article.url, "title": article.title or ""}
-        config = SiteConfig(name="backfill", listing_url="", pagination="")
+        article_dict = {"content": raw, "url": url, "title": title or ""}
         processed = process_article(article_dict, config, pipeline=CLEANING_PIPELINE)
         body = processed.get("content", "")
 
-        log.info(f"Refetched content for article {article.id}: {len(body)} chars")
+        log.info(f"Refetched content for article {article_id}: {len(body)} chars")
         return body
     except Exception as e:
-        log.error(f"Failed to refetch article {article.id}: {e}")
+        log.error(f"Failed to refetch article {article_id}: {e}")
         return None
 
 
-def backfill_summaries(session, articles):
-    """Reprocess summaries for articles with missing/empty summaries."""
-    fixed = 0
+def refetch_missing_content(session, articles, config: SiteConfig = REFETCH_CONFIG) -> int:
+    """Refetch content for articles that have none, up to config.max_concurrency at once (caller commits)."""
+    missing = [a for a in articles if not a.content]
+    if not missing:
+        return 0
+    log.info(f"Refetching content for {len(missing)} articles ({config.max_concurrency} at a time)")
+    # Plain values only: ORM instances stay on this thread with their session
+    jobs = [(a.id, a.url, a.title) for a in missing]
+    with make_client(config) as client, ThreadPoolExecutor(max_workers=config.max_concurrency) as pool:
+        bodies = list(pool.map(lambda job: refetch_content(client, *job, config), jobs))
+    fetched = 0
+    for article, body in zip(missing, bodies):
+        if body:
+            article.content = body
+            fetched += 1
+    return fetched
+
+
+def backfill_summaries(session, articles, pool: ThreadPoolExecutor) -> int:
+    """Summarize one batch of articles on `pool` and commit the results together."""
+    refetch_missing_content(session, articles)
+    ready = [a for a in articles if a.content]
     for article in articles:
         if not article.content:
-            log.info(f"Article {article.id} missing content — refetching")
-            content = refetch_content(article)
-            if not content:
-                log.warning(f"Skipping article {article.id} — refetch failed")
-                continue
-            article.content = content
-            session.commit()
-
-        log.info(f"Backfilling summary for: {article.title[:60]}")
-        result = summarize(article.content, url=article.url)
+            log.warning(f"Skipping article {article.id} — refetch failed")
+            record_failed_attempt(article)
 
+    # Workers get plain values; results are applied to the ORM rows on this thread
+    futures = [pool.submit(contextvars.copy_context().run, summarize, a.content, url=a.url) for a in ready]
+    existing = {s.article_id: s for s in
+                session.query(ArticleSummary).filter(ArticleSummary.article_id.in_([a.id for a in ready]))}
+    fixed = 0
+    for article, future in zip(ready, futures):
+        try:
+            result = future.result()
+        except Exception as e:
+            log.error(f"Summarize failed for article {article.id}: {e}")
+            result = None
         if result is None or not result.get("subtitle"):
             log.warning(f"Still failed for article {article.id}")
+            record_failed_attempt(article)
             continue
 
-        # Check if summary row exists
-        existing = session.query(ArticleSummary).filter_by(article_id=article.id).first()
-        if existing:
-            existing.subtitle = result["subtitle"]
-            existing.bullets = result["bullets"]
+        summary = existing.get(article.id)
+        if summary:
+            summary.subtitle = result["subtitle"]
+            summary.bullets = result["bullets"]
+            summary.model = DEFAULT_MODEL
+            summary.prompt_version = SUMMARY_PROMPT_VERSION
         else:
-            summary = ArticleSummary(
+            session.add(ArticleSummary(
                 article_id=article.id,
                 version=1,
                 subtitle=result["subtitle"],
                 bullets=result["bullets"],
                 is_auto=True,
-            )
-            session.add(summary)
-
-        session.commit()
+                model=DEFAULT_MODEL,
+                prompt_version=SUMMARY_PROMPT_VERSION,
+            ))
+        article.needs_summary = False
+        article.next_attempt_at = None
         fixed += 1
 
+    session.commit()
     return fixed
 
 
-def backfill_tags(session, articles):
-    """Reprocess tags for articles with no tags."""
-    fixed = 0
+def backfill_tags(session, articles) -> int:
+    """Auto-tag one batch of articles and commit."""
+    tagged = {a.id: auto_tag(f"{a.title} {a.content or ''}") for a in articles}
+    # Tagged once, whatever the outcome: matching no tag is a valid result, not a failure
     for article in articles:
-        if not article.content and not article.title:
-            log.warning(f"Skipping article {article.id} — no content to tag")
-            continue
-
-        text = f"{article.title} {article.content or ''}"
-        tags = auto_tag(text)
-
-        if not tags:
-            continue
-
-        log.info(f"Backfilling {len(tags)} tags for: {article.title[:60]}")
-        for tag_name in tags:
-            tag = _get_or_create_tag(session, tag_name)
-            article_tag = ArticleTag(
-                article_id=article.id,
-                tag_id=tag.id,
-                is_auto=True,
-            )
-            session.add(article_tag)
-
-        session.commit()
-        fixed += 1
-
-    return fixed
-
-
-def run_backfill(db=None):
-    """Find and fix all articles with missing summaries or tags."""
+        article.needs_tags = False
+    tag_ids = _resolve_tags(session, {t for tags in tagged.values() for t in tags})
+    rows = [dict(article_id=article_id, tag_id=tag_ids[t], is_auto=True)
+            for article_id, tags in tagged.items() for t in tags]
+    if rows:
+        session.execute(pg_insert(ArticleTag).on_conflict_do_nothing(), rows)
+    session.commit()
+    return sum(1 for tags in tagged.values() if tags)
+
+
+def run_backfill(db=None, limit: Optional[int] = None, since: Optional[date] = None,
+                 concurrency: int = DEFAULT_CONCURRENCY):
+    """Fix up to `limit` articles (each) missing summaries or tags, optionally only those dated since `since`."""
     owns_session = db is None
     session = db if db else get_session()
     try:
-        # Backfill summaries
-        missing_summaries = get_articles_missing_summaries(session)
-        log.info(f"Found {len(missing_summaries)} articles missing summaries")
-        fixed_summaries = backfill_summaries(session, missing_summaries)
-
-        # Backfill tags
-        missing_tags = get_articles_missing_tags(session)
-        log.info(f"Found {len(missing_tags)} articles missing tags")
-        fixed_tags = backfill_tags(session, missing_tags)
+        fixed_summaries = fixed_tags = seen = 0
+        with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="backfill") as pool:
+            for batch in iter_batches(get_articles_missing_summaries(session, since), limit):
+                seen += len(batch)
+                fixed_summaries += backfill_summaries(session, batch, pool)
+                log.info(f"Summaries: {fixed_summaries}/{seen} fixed so far")
+
+        seen = 0
+        for batch in iter_batches(get_articles_missing_tags(session, since), limit):
+            seen += len(batch)
+            fixed_tags += backfill_tags(session, batch)
+        log.info(f"Tagged {seen} articles")
 
         log.info(f"Backfill complete: {fixed_summaries} summaries fixed, {fixed_tags} tags fixed")
         return {"summaries_fixed": fixed_summaries, "tags_fixed": fixed_tags}
     finally:
         if owns_session:
             session.close()
+
+
+def main():
+    import newsfeed.env  # noqa: F401 — load .env once
+    from newsfeed.logcontext import LOG_FORMAT
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    parser = argparse.ArgumentParser(description="Backfill missing summaries and tags")
+    parser.add_argument("--limit", type=int, default=None, help="Max articles to process per kind")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="Only articles dated on/after (YYYY-MM-DD)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help="Summaries generated in parallel")
+    args = parser.parse_args()
+    run_backfill(limit=args.limit, since=args.since, concurrency=args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,27 @@ MODEL_TOKEN_LIMITS = {
     "gemini-1.5-pro": 2097152,
 }
 
+# Per-model API quotas: requests and tokens per minute (enforced by newsfeed.llm)
+MODEL_RATE_LIMITS = {
+    "gemma-3-27b-it":   {"rpm": 30, "tpm": 15_000},
+    "gemini-2.5-flash": {"rpm": 10, "tpm": 250_000},
+    "gemini-2.0-flash": {"rpm": 15, "tpm": 1_000_000},
+    "gemini-1.5-flash": {"rpm": 15, "tpm": 1_000_000},
+    "gemini-1.5-pro":   {"rpm": 2, "tpm": 32_000},
+}
+DEFAULT_RATE_LIMIT = {"rpm": 10, "tpm": 250_000}
+
+# ── Upstreams ───────────────────────────────────────────────
+JINA_MAX_IN_FLIGHT = 8  # r.jina.ai requests in flight across all sites running in this process
+
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional
-import json
+import copy, json, logging, re
 from pathlib import Path
 
+log = logging.getLogger("newsfeed.config")
+
 # ── Dataclasses ─────────────────────────────────────────────
 
 @dataclass
@@ -25,9 +40,12 @@ class SiteConfig:
     pagination: str                          # e.g. "?page={n}"
     source_type: str = "news"                # "news" or "facility_listing"
     poll_frequency_days: int = 1
-    request_delay: float = 1.0               # seconds between requests
+    request_delay: float = 1.0               # seconds between requests (per host)
+    max_concurrency: int = 4                 # parallel content fetches in flight
+    process_workers: int = 4                 # articles cleaned/summarized in parallel
     max_retries: int = 3
     eager_fetch: bool = True                 # fetch full content immediately?
+    cache_listings: bool = True              # conditional listing requests; stop early if page 1 is unchanged
     verify_ssl: bool = True
 
     # Config-driven listing parser
@@ -38,6 +56,7 @@ class SiteConfig:
     # Content extraction markers
     content_start: Optional[str] = None      # regex marker for body start
     content_end: Optional[str] = None        # regex marker for body end
+    noise_patterns: list[str] = field(default_factory=list)  # regexes; matching lines are dropped
 
     # Processing pipeline
     pipeline: list[str] = field(default_factory=lambda: [
@@ -51,26 +70,69 @@ class SiteState:
     name: str
     last_pulled_at: Optional[datetime] = None
     last_article_date: Optional[str] = None  # "YYYY-MM-DD"
+    # Listing URL → article URLs on its page 1 this run; save_state hands them to the listing cache
+    listing_urls: dict[str, list[str]] = field(default_factory=dict)
 
 # ── JSON Loader ─────────────────────────────────────────────
+# Site configs are parsed, validated and their patterns precompiled once per file
+# version; callers get a copy, so per-run tweaks never leak into the registry.
 
 SITES_DIR = Path(__file__).parent / "sites"
 
+_registry: dict[Path, tuple[int, SiteConfig]] = {}  # path → (mtime_ns, validated config)
+
+def validate_site_config(config: SiteConfig) -> list[str]:
+    """Problems with a config's patterns and pipeline; compiles (and caches) every pattern."""
+    from newsfeed.patterns import compile_pattern
+    from newsfeed.processing import TOOLS
+    from newsfeed.processing.noise import compile_site_rules
+    problems = []
+    for label in ("listing_pattern", "content_start", "content_end"):
+        pattern = getattr(config, label)
+        if not pattern: continue
+        try:
+            compiled = compile_pattern(pattern)
+        except re.error as e:
+            problems.append(f"{label}: {e}")
+            continue
+        if label == "listing_pattern" and compiled.groups < len(config.listing_fields):
+            problems.append(f"listing_pattern has {compiled.groups} groups for "
+                            f"{len(config.listing_fields)} listing_fields")
+    try:
+        compile_site_rules(tuple(config.noise_patterns))
+    except re.error as e:
+        problems.append(f"noise_patterns: {e}")
+    unknown = [t for t in config.pipeline if t not in TOOLS]
+    if unknown: problems.append(f"unknown pipeline tools: {unknown}")
+    return problems
+
+def _load(path: Path) -> SiteConfig:
+    """Validated config for `path`, re-read only when the file's mtime changes. Raises ValueError."""
+    mtime = path.stat().st_mtime_ns
+    cached = _registry.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as f:
+            data = json.load(f)
+        config = SiteConfig(**data)
+        problems = validate_site_config(config)
+        if problems: raise ValueError(f"{path.name}: " + "; ".join(problems))
+        cached = _registry[path] = (mtime, config)
+        log.info(f"Loaded site config {path.stem}")
+    return copy.deepcopy(cached[1])
+
 def load_site_config(site_name: str) -> SiteConfig:
     """Load a SiteConfig from a JSON file in the sites/ folder."""
-    path = SITES_DIR / f"{site_name}.json"
-    with open(path) as f:
-        data = json.load(f)
-    return SiteConfig(**data)
+    return _load(SITES_DIR / f"{site_name}.json")
 
 def load_all_site_configs() -> dict[str, SiteConfig]:
-    """Load all site configs from the sites/ folder."""
+    """Load all site configs from the sites/ folder, skipping (and logging) invalid ones."""
     configs = {}
     for path in SITES_DIR.glob("*.json"):
         if path.stem == 'tags': continue
-        with open(path) as f:
-            data = json.load(f)
-        configs[path.stem] = SiteConfig(**data)
+        try:
+            configs[path.stem] = _load(path)
+        except (ValueError, TypeError) as e:
+            log.error(f"Skipping site config {path.name}: {e}")
     return configs
 
 # ── State Persistence (DB-backed) ───────────────────────────
@@ -96,7 +158,8 @@ def load_state(site_name: str, db=None) -> SiteState:
             db.close()
 
 def save_state(state: SiteState, db=None):
-    """Save SiteState to the sources table."""
+    """Save SiteState to the sources table, then record the run's page-1 URLs in the listing cache."""
+    from newsfeed.fetch.cache import listing_cache
     from newsfeed.storage.database import get_session
     from newsfeed.storage.models import Source
     owns_session = db is None
@@ -108,6 +171,8 @@ def save_state(state: SiteState, db=None):
             source.last_pulled_at = state.last_pulled_at
             source.last_article_date = state.last_article_date
             db.commit()
+        for url, article_urls in state.listing_urls.items():
+            listing_cache.remember_urls(url, article_urls)
     finally:
         if owns_session:
             db.close()
@@ -1,5 +1,7 @@
 """Cost tracking for LLM API usage."""
 import threading
+from contextvars import ContextVar
+from typing import Optional
 from newsfeed.config import DEFAULT_MODEL
 
 _lock = threading.Lock()
@@ -12,25 +14,57 @@ PRICING = {
     "gemma-3-27b-it":   {"input": 0.00, "output": 0.00},  # free tier
 }
 
-_daily_usage = {"input_tokens": 0, "output_tokens": 0, "model": DEFAULT_MODEL}
+# Usage is held in a ContextVar so sites run in parallel (each in its own copied
+# context) keep separate totals; threads started with copy_context share their
+# parent's counters. There is no shared default: a context that never called
+# reset_daily_usage() gets its own counters on first use.
+
+def _new_usage() -> dict:
+    return {"input_tokens": 0, "output_tokens": 0, "model": DEFAULT_MODEL,
+            "cache_hits": 0, "cache_misses": 0, "by_model": {}}
+
+_usage: ContextVar[Optional[dict]] = ContextVar("newsfeed_usage", default=None)
+
+def _current() -> dict:
+    usage = _usage.get()
+    if usage is None:
+        usage = _new_usage()
+        _usage.set(usage)
+    return usage
 
 def track_usage(input_tokens: int, output_tokens: int, model: str = None):
-    """Add token counts to daily running total."""
+    """Add token counts to the current run's running total (safe to call from worker threads)."""
     if model is None: model = DEFAULT_MODEL
+    usage = _current()
     with _lock:
-        _daily_usage["input_tokens"] += input_tokens or 0
-        _daily_usage["output_tokens"] += output_tokens or 0
-        _daily_usage["model"] = model
+        usage["input_tokens"] += input_tokens or 0
+        usage["output_tokens"] += output_tokens or 0
+        usage["model"] = model
+        totals = usage["by_model"].setdefault(model, [0, 0])
+        totals[0] += input_tokens or 0
+        totals[1] += output_tokens or 0
+
+def track_cache(hit: bool):
+    """Count a summary cache lookup."""
+    usage = _current()
+    with _lock:
+        usage["cache_hits" if hit else "cache_misses"] += 1
 
 def get_daily_cost() -> dict:
-    """Calculate cost for today's usage."""
+    """Calculate cost for the current run's usage, priced per model."""
+    usage = _current()
     with _lock:
-        model = _daily_usage["model"]
-        input_tokens = _daily_usage["input_tokens"]
-        output_tokens = _daily_usage["output_tokens"]
-    prices = PRICING.get(model, PRICING[DEFAULT_MODEL])
-    input_cost = (input_tokens / 1_000_000) * prices["input"]
-    output_cost = (output_tokens / 1_000_000) * prices["output"]
+        model = usage["model"]
+        input_tokens = usage["input_tokens"]
+        output_tokens = usage["output_tokens"]
+        cache_hits = usage["cache_hits"]
+        cache_misses = usage["cache_misses"]
+        by_model = {m: tuple(t) for m, t in usage["by_model"].items()}
+    input_cost = output_cost = 0.0
+    for m, (m_in, m_out) in by_model.items():
+        prices = PRICING.get(m, PRICING[DEFAULT_MODEL])
+        input_cost += (m_in / 1_000_000) * prices["input"]
+        output_cost += (m_out / 1_000_000) * prices["output"]
     return {
         "model": model,
         "input_tokens": input_tokens,
@@ -38,10 +72,10 @@ def get_daily_cost() -> dict:
         "input_cost": round(input_cost, 6),
         "output_cost": round(output_cost, 6),
         "total_cost": round(input_cost + output_cost, 6),
+        "cache_hits": cache_hits,
+        "cache_misses": cache_misses,
     }
 
 def reset_daily_usage():
-    """Reset counters (call at start of each run)."""
-    with _lock:
-        _daily_usage["input_tokens"] = 0
-        _daily_usage["output_tokens"] = 0
+    """Start fresh counters for the current context (call at start of each run)."""
+    _usage.set(_new_usage())
@@ -1,4 +1,4 @@
 from .orchestrator import fetch_new_articles
-from .client import make_client, jina_fetch
+from .client import make_client, make_async_client, jina_fetch, jina_fetch_async
 from .pagination import paginate_listings
 from .parser import parse_listing
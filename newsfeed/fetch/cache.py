@@ -0,0 +1,89 @@
+"""On-disk HTTP cache for listing pages, keyed by URL.
+
+Each entry keeps the response validators (ETag / Last-Modified), the body
+itself and the article URLs listed on it as of the last successful run. Entries
+not written for MAX_AGE are pruned, and at most MAX_ENTRIES are kept.
+"""
+import hashlib, json, logging, os, threading, time
+from dataclasses import dataclass, field, asdict, fields
+from pathlib import Path
+from typing import Optional
+
+log = logging.getLogger("newsfeed.fetch")
+
+CACHE_DIR = Path(os.environ.get("NEWSFEED_HTTP_CACHE", Path(__file__).parent / ".http_cache"))
+MAX_AGE = 30 * 86400   # seconds since an entry was last written
+MAX_ENTRIES = 1000
+PRUNE_EVERY = 100      # writes between prunes (and once on the first write)
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    article_urls: list[str] = field(default_factory=list)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if self.etag: headers["If-None-Match"] = self.etag
+        if self.last_modified: headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+class HTTPCache:
+    """One JSON file per URL under `root`; writes are atomic (temp file + rename)."""
+
+    def __init__(self, root: Path = CACHE_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _path(self, url: str) -> Path:
+        return self.root / f"{hashlib.sha256(url.encode()).hexdigest()[:32]}.json"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(url)) as f:
+                data = json.load(f)
+            return CacheEntry(**{f.name: data[f.name] for f in fields(CacheEntry) if f.name in data})
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            log.warning(f"Ignoring unreadable cache entry for {url}: {e}")
+            return None
+
+    def put(self, entry: CacheEntry):
+        path = self._path(entry.url)
+        with self._lock:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+                tmp.write_text(json.dumps(asdict(entry)))
+                os.replace(tmp, path)
+            except OSError as e:
+                log.warning(f"Could not write cache entry for {entry.url}: {e}")
+            if self._writes % PRUNE_EVERY == 0: self._prune()
+            self._writes += 1
+
+    def _prune(self):
+        """Drop entries older than MAX_AGE, then the oldest beyond MAX_ENTRIES (caller holds the lock)."""
+        try:
+            entries = sorted(((p.stat().st_mtime, p) for p in self.root.glob("*.json")), reverse=True)
+        except OSError:
+            return
+        cutoff = time.time() - MAX_AGE
+        stale = [p for i, (mtime, p) in enumerate(entries) if mtime < cutoff or i >= MAX_ENTRIES]
+        for p in stale:
+            try: p.unlink()
+            except OSError: pass
+        if stale: log.info(f"Pruned {len(stale)} listing cache entries")
+
+    def remember_urls(self, url: str, article_urls: list[str]):
+        """Record the article URLs listed on the cached page (once the run that saw them has saved)."""
+        entry = self.get(url)
+        if entry is None or entry.article_urls == article_urls: return
+        entry.article_urls = article_urls
+        self.put(entry)
+
+listing_cache = HTTPCache()
@@ -1,17 +1,114 @@
-import time, logging, httpx
-from newsfeed.config import SiteConfig
+import asyncio, threading, logging, httpx
+from typing import Optional
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from newsfeed import fixtures
+from newsfeed.config import SiteConfig, JINA_MAX_IN_FLIGHT
+from newsfeed.ratelimit import TokenBucket
+from .cache import HTTPCache, CacheEntry
 
 log = logging.getLogger("newsfeed.fetch")
 
+# ── Per-Host Rate Limiting ──────────────────────────────────
+
+_host_limiters: dict[str, TokenBucket] = {}
+_host_lock = threading.Lock()
+
+def host_limiter(url: str, delay: float) -> TokenBucket:
+    """Shared token bucket for the URL's host, allowing one request per `delay` seconds.
+
+    There is one bucket per host for the life of the process; callers asking for
+    different delays get the slowest one requested so far.
+    """
+    host = urlparse(url).netloc.lower()
+    with _host_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = _host_limiters[host] = TokenBucket(rate=1 / delay)
+        elif 1 / delay < limiter.rate:
+            limiter.slow_to(1 / delay)
+        return limiter
+
+# ── Shared Upstream Cap ─────────────────────────────────────
+# Every site fetches through r.jina.ai; this caps requests in flight across all
+# sites and event loops in the process, whatever each site's own concurrency.
+
+_jina_slots = threading.BoundedSemaphore(JINA_MAX_IN_FLIGHT)
+
+@asynccontextmanager
+async def _jina_slot():
+    """Hold one global r.jina.ai slot without blocking the event loop.
+
+    The wait happens on a thread, so a waiter wakes as soon as a slot is
+    released; if the task is cancelled meanwhile, the slot is handed back.
+    """
+    acquiring = asyncio.ensure_future(asyncio.to_thread(_jina_slots.acquire))
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        acquiring.add_done_callback(lambda f: f.cancelled() or f.exception() or _jina_slots.release())
+        raise
+    try:     yield
+    finally: _jina_slots.release()
+
+# ── Clients ─────────────────────────────────────────────────
+
 def make_client(config: SiteConfig) -> httpx.Client:
-    """Create an HTTP client with retry support."""
-    transport = httpx.HTTPTransport(retries=config.max_retries, verify=config.verify_ssl)
-    return httpx.Client(transport=transport, timeout=30)
+    """Create a pooled, thread-safe HTTP client with retry support, sized to the site's concurrency cap."""
+    transport = httpx.HTTPTransport(
+        retries=config.max_retries, verify=config.verify_ssl,
+        limits=httpx.Limits(max_connections=config.max_concurrency,
+                            max_keepalive_connections=config.max_concurrency),
+    )
+    return httpx.Client(transport=fixtures.wrap_transport(transport), timeout=30)
+
+def make_async_client(config: SiteConfig) -> httpx.AsyncClient:
+    """Create a pooled async HTTP client sized to the site's concurrency cap."""
+    transport = httpx.AsyncHTTPTransport(
+        retries=config.max_retries, verify=config.verify_ssl,
+        limits=httpx.Limits(max_connections=config.max_concurrency,
+                            max_keepalive_connections=config.max_concurrency),
+    )
+    return httpx.AsyncClient(transport=fixtures.wrap_async_transport(transport), timeout=30)
+
+# ── Jina Reader ─────────────────────────────────────────────
 
 def jina_fetch(client: httpx.Client, url: str, delay: float = 1.0) -> str:
     """Fetch a URL via Jina Reader with rate limiting."""
-    time.sleep(delay)
-    resp = client.get(f"https://r.jina.ai/{url}")
+    if delay > 0: host_limiter(url, delay).acquire_sync()
+    with _jina_slots:
+        resp = client.get(f"https://r.jina.ai/{url}")
+    resp.raise_for_status()
+    log.debug(f"Fetched {url} ({len(resp.text)} chars)")
+    return resp.text
+
+async def jina_fetch_async(client: httpx.AsyncClient, url: str, delay: float = 1.0) -> str:
+    """Async variant of jina_fetch; waits on the host's token bucket instead of sleeping."""
+    if delay > 0: await host_limiter(url, delay).acquire()
+    async with _jina_slot():
+        resp = await client.get(f"https://r.jina.ai/{url}")
     resp.raise_for_status()
     log.debug(f"Fetched {url} ({len(resp.text)} chars)")
     return resp.text
+
+async def jina_fetch_cached(client: httpx.AsyncClient, url: str, delay: float,
+                            cache: HTTPCache) -> tuple[str, Optional[CacheEntry]]:
+    """jina_fetch_async with a conditional request against the on-disk cache.
+
+    Returns (body, previous entry). A 304 serves the cached body; a 200 refreshes
+    the stored body and validators.
+    """
+    previous = cache.get(url)
+    headers = previous.conditional_headers() if previous else {}
+    if delay > 0: await host_limiter(url, delay).acquire()
+    async with _jina_slot():
+        resp = await client.get(f"https://r.jina.ai/{url}", headers=headers)
+    if resp.status_code == 304 and previous:
+        log.debug(f"Not modified: {url}")
+        return previous.body, previous
+    resp.raise_for_status()
+    cache.put(CacheEntry(url=url, body=resp.text,
+                         etag=resp.headers.get("etag"), last_modified=resp.headers.get("last-modified"),
+                         article_urls=previous.article_urls if previous else []))
+    log.debug(f"Fetched {url} ({len(resp.text)} chars)")
+    return resp.text, previous
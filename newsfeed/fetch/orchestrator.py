@@ -1,12 +1,16 @@
-import logging
+import asyncio, contextvars, logging, queue, threading
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Iterator, Optional
 from newsfeed.config import SiteConfig, SiteState
-from .client import make_client, jina_fetch
-from .pagination import paginate_listings
+from .cache import listing_cache
+from .client import make_async_client, jina_fetch, jina_fetch_async
+from .pagination import paginate_listings, historical_listings
+from .urls import canonicalize_url, url_variants
 
 log = logging.getLogger("newsfeed.fetch")
 
+_DONE = object()  # end-of-stream marker on the hand-off queue
+
 def default_from_date(days_back: int = 7) -> str:
     return (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
 
@@ -32,14 +36,46 @@ def filter_by_date(articles: list[dict], from_date: str, to_date: str) -> tuple[
         if a["date"] <= to_date:  filtered.append(a)
     return filtered, False
 
-def enrich_with_content(client, articles: list[dict], config: SiteConfig) -> list[dict]:
-    """Fetch full article content for each article (eager mode)."""
+def drop_known(articles: list[dict], config: SiteConfig, seen: set[str]) -> list[dict]:
+    """Drop articles already stored (or seen earlier this run), comparing canonical URLs."""
+    from newsfeed.storage.repository import find_existing_urls
+    variants = {id(a): url_variants(a["url"]) for a in articles}
+    try:
+        known = find_existing_urls(set().union(*variants.values()))
+    except Exception as e:
+        log.warning(f"[{config.name}] URL dedup lookup failed, keeping page as-is: {e}")
+        known = set()
+    fresh = []
     for a in articles:
-        log.info(f"[{config.name}] Fetching article: {a.get('title', 'unknown')[:60]}")
-        try:    a["content"] = jina_fetch(client, a["url"], config.request_delay)
-        except Exception as e:
-            log.warning(f"[{config.name}] Failed to fetch {a['url']}: {e}")
-            a["content"] = None
+        key = canonicalize_url(a["url"])
+        if key in seen or not known.isdisjoint(variants[id(a)]): continue
+        seen.add(key)
+        fresh.append(a)
+    if len(fresh) < len(articles):
+        log.info(f"[{config.name}] Skipping {len(articles) - len(fresh)} already-stored articles")
+    return fresh
+
+async def enrich_with_content(client, articles: list[dict], config: SiteConfig,
+                              slots: Optional[asyncio.Semaphore] = None,
+                              emit=None, stop: Optional[threading.Event] = None) -> list[dict]:
+    """Fetch full article content for each article (eager mode), up to max_concurrency at once.
+
+    Pass `slots` to share the cap across calls; if `emit` is given, each article is
+    handed to it as soon as its content arrives.
+    """
+    if slots is None: slots = asyncio.Semaphore(config.max_concurrency)
+
+    async def fetch_one(a):
+        async with slots:
+            if stop is not None and stop.is_set(): return
+            log.info(f"[{config.name}] Fetching article: {a.get('title', 'unknown')[:60]}")
+            try:    a["content"] = await jina_fetch_async(client, a["url"], config.request_delay)
+            except Exception as e:
+                log.warning(f"[{config.name}] Failed to fetch {a['url']}: {e}")
+                a["content"] = None
+        if emit is not None: await emit(a)
+
+    await asyncio.gather(*(fetch_one(a) for a in articles))
     return articles
 
 def fetch_article_content(client, article: dict, config: SiteConfig) -> dict:
@@ -56,21 +92,83 @@ def fetch_new_articles(
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
     max_pages: int = 5,
-) -> list[dict]:
-    """Discover and optionally fetch new articles from a site."""
+    buffer: Optional[int] = None,
+    historical: bool = False,
+) -> Iterator[dict]:
+    """Discover and optionally fetch new articles from a site, yielding each one as soon as it is ready.
+
+    Discovery runs on its own event loop in a background thread and hands articles
+    over through a queue of `buffer` slots (default 2 × max_concurrency), so a slow
+    consumer pauses fetching instead of fetched pages piling up in memory. State is
+    updated once the stream is exhausted, including the page-1 URLs that
+    save_state records in the listing cache.
+
+    Incremental runs (no explicit `from_date`) stop before any content fetch when
+    page 1 of the listing is unchanged since the previous run. With `historical`,
+    only the pages covering the range are fetched, located by binary search
+    within the first `max_pages`.
+    """
+    stop_if_unchanged = from_date is None and not historical
     from_date, to_date = resolve_dates(state, from_date, to_date)
     log.info(f"[{config.name}] Run: {from_date} → {to_date}")
+    out = queue.Queue(maxsize=buffer or config.max_concurrency * 2)
+    stop = threading.Event()
+    outcome, page1_urls = {}, {}
 
-    all_articles = []
-    with make_client(config) as client:
-        for page_articles in paginate_listings(client, config, max_pages):
-            filtered, cutoff = filter_by_date(page_articles, from_date, to_date)
-            all_articles.extend(filtered)
-            if cutoff: break
+    def produce():
+        try:
+            outcome["listed"] = asyncio.run(_discover(config, from_date, to_date, max_pages, out, stop,
+                                                      stop_if_unchanged, historical, page1_urls))
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            out.put(_DONE)
+
+    threading.Thread(target=contextvars.copy_context().run, args=(produce,),
+                     name=f"fetch-{config.name}", daemon=True).start()
+    count, article = 0, None
+    try:
+        while (article := out.get()) is not _DONE:
+            count += 1
+            yield article
+    finally:
+        if article is not _DONE:
+            # Consumer stopped early: tell discovery to wind down and unblock its pending puts
+            stop.set()
+            while out.get() is not _DONE: pass
+    if "error" in outcome: raise outcome["error"]
+    state.listing_urls.update(page1_urls)
+    if outcome["listed"]: update_state(state, to_date)
+    log.info(f"[{config.name}] Done: {count} new articles ({outcome['listed']} listed in range)")
 
-        if config.eager_fetch and all_articles:
-            enrich_with_content(client, all_articles, config)
+async def _discover(config: SiteConfig, from_date: str, to_date: str, max_pages: int,
+                    out: queue.Queue, stop: threading.Event, stop_if_unchanged: bool = False,
+                    historical: bool = False, page1_urls: Optional[dict] = None) -> int:
+    """Paginate listings onto `out`, fetching content for each page while the next one loads.
 
-    if all_articles: update_state(state, to_date)
-    log.info(f"[{config.name}] Done: {len(all_articles)} new articles")
-    return all_articles
+    Returns the number of in-range articles listed before dedup.
+    """
+    async def emit(article):
+        if not stop.is_set(): await asyncio.to_thread(out.put, article)
+
+    content_tasks, seen, listed = [], set(), 0
+    slots = asyncio.Semaphore(config.max_concurrency)
+    async with make_async_client(config) as client:
+        if historical:
+            listings = historical_listings(client, config, from_date, to_date, max_pages)
+        else:
+            cache = listing_cache if config.cache_listings else None
+            listings = paginate_listings(client, config, max_pages, cache, stop_if_unchanged, page1_urls)
+        async for page_articles in listings:
+            if stop.is_set(): break
+            filtered, cutoff = filter_by_date(page_articles, from_date, to_date)
+            listed += len(filtered)
+            fresh = await asyncio.to_thread(drop_known, filtered, config, seen)
+            if config.eager_fetch and fresh:
+                content_tasks.append(asyncio.create_task(
+                    enrich_with_content(client, fresh, config, slots, emit, stop)))
+            else:
+                for a in fresh: await emit(a)
+            if cutoff: break
+        await asyncio.gather(*content_tasks)
+    return listed
@@ -1,7 +1,8 @@
-import logging
-from typing import Iterator
+import asyncio, logging
+from typing import AsyncIterator, Awaitable, Optional
 from newsfeed.config import SiteConfig
-from .client import jina_fetch
+from .cache import HTTPCache
+from .client import jina_fetch_async, jina_fetch_cached
 from .parser import parse_listing
 
 log = logging.getLogger("newsfeed.fetch")
@@ -11,13 +12,104 @@ def build_listing_url(listing_url: str, page_num: int, pagination: str) -> str:
     if page_num <= 1: return listing_url
     return listing_url + pagination.format(n=page_num)
 
-def paginate_listings(client, config: SiteConfig, max_pages: int = 5) -> Iterator[list[dict]]:
-    """Yield one page of parsed articles at a time."""
+async def paginate_listings(client, config: SiteConfig, max_pages: int = 5, cache: Optional[HTTPCache] = None,
+                            stop_if_unchanged: bool = False,
+                            page1_urls: Optional[dict[str, list[str]]] = None) -> AsyncIterator[list[dict]]:
+    """Yield one page of parsed articles at a time.
+
+    With a `cache`, pages are fetched conditionally; if `stop_if_unchanged` and page 1
+    lists exactly the URLs recorded for it last run, nothing is yielded. Page 1's URLs
+    go into `page1_urls` (listing URL → article URLs) for the caller to record once
+    the run's articles are saved, never here: a run that fails later must not make
+    the next one skip these articles.
+    """
     for page in range(1, max_pages + 1):
         url = build_listing_url(config.listing_url, page, config.pagination)
         log.info(f"[{config.name}] Fetching page {page}")
-        md = jina_fetch(client, url, config.request_delay)
+        if cache is None:
+            md, previous = await jina_fetch_async(client, url, config.request_delay), None
+        else:
+            md, previous = await jina_fetch_cached(client, url, config.request_delay, cache)
         articles = parse_listing(md, config)
         log.info(f"[{config.name}] Page {page}: {len(articles)} articles")
         if not articles: break
+        if cache is not None and page == 1:
+            urls = [a["url"] for a in articles]
+            if stop_if_unchanged and previous and urls == previous.article_urls:
+                log.info(f"[{config.name}] Page 1 unchanged since last run — stopping")
+                return
+            if page1_urls is not None: page1_urls[url] = urls
         yield articles
+
+# ── Historical Crawl ────────────────────────────────────────
+# Listings run newest first, so for a date range far in the past the pages that
+# cover it can be found by binary search on the dates parsed from each page,
+# then fetched in parallel instead of walking every page from 1.
+
+class ListingPages:
+    """Listing pages fetched on demand and memoized, so probes are never re-fetched."""
+
+    def __init__(self, client, config: SiteConfig, max_pages: int):
+        self.client, self.config, self.max_pages = client, config, max_pages
+        self._pages: dict[int, asyncio.Task] = {}
+
+    def get(self, page: int) -> Awaitable[list[dict]]:
+        if page > self.max_pages: return _no_articles()
+        if page not in self._pages:
+            self._pages[page] = asyncio.ensure_future(self._fetch(page))
+        return self._pages[page]
+
+    async def _fetch(self, page: int) -> list[dict]:
+        url = build_listing_url(self.config.listing_url, page, self.config.pagination)
+        log.info(f"[{self.config.name}] Fetching page {page}")
+        articles = parse_listing(await jina_fetch_async(self.client, url, self.config.request_delay), self.config)
+        log.info(f"[{self.config.name}] Page {page}: {len(articles)} articles")
+        return articles
+
+    async def dates(self, page: int) -> list[str]:
+        return [a["date"] for a in await self.get(page) if a.get("date")]
+
+async def _no_articles() -> list[dict]:
+    return []
+
+async def _first_page(pages: ListingPages, lo: int, hi: int, predicate) -> int:
+    """Smallest page in [lo, hi] whose dates satisfy `predicate` (hi + 1 if none); predicate is monotone."""
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if predicate(await pages.dates(mid)): hi = mid - 1
+        else: lo = mid + 1
+    return lo
+
+async def find_page_span(pages: ListingPages, from_date: str, to_date: str) -> Optional[tuple[int, int]]:
+    """First and last page listing articles dated within [from_date, to_date], or None."""
+    reaches_to = lambda dates: not dates or min(dates) <= to_date      # page is at or past to_date
+    before_from = lambda dates: not dates or max(dates) < from_date    # page is entirely older than the range
+
+    # Gallop to bound the search: 1, 2, 4, ... until a page lies entirely before the range
+    hi = 1
+    while hi < pages.max_pages and not before_from(await pages.dates(hi)):
+        hi = min(hi * 2, pages.max_pages)
+    first = await _first_page(pages, 1, hi, reaches_to)
+    last = await _first_page(pages, first, hi, before_from) - 1
+    if first > last: return None
+    log.info(f"[{pages.config.name}] Pages {first}–{last} cover {from_date} → {to_date}")
+    return first, last
+
+async def historical_listings(client, config: SiteConfig, from_date: str, to_date: str,
+                              max_pages: int) -> AsyncIterator[list[dict]]:
+    """Yield, in page order, only the listing pages covering [from_date, to_date].
+
+    Pages are located by binary search, then the span is fetched with up to
+    max_concurrency pages in flight (probed pages are reused, not re-fetched).
+    """
+    pages = ListingPages(client, config, max_pages)
+    span = await find_page_span(pages, from_date, to_date)
+    if span is None:
+        log.info(f"[{config.name}] No listing pages cover {from_date} → {to_date}")
+        return
+    first, last = span
+    for page in range(first, last + 1):
+        for ahead in range(page, min(page + config.max_concurrency, last + 1)):
+            pages.get(ahead)
+        articles = await pages.get(page)
+        if articles: yield articles
@@ -1,7 +1,8 @@
-import re, logging
+import logging
 from datetime import datetime
 from typing import Optional
 from newsfeed.config import SiteConfig
+from newsfeed.patterns import compile_pattern
 
 log = logging.getLogger("newsfeed.fetch")
 
@@ -21,7 +22,7 @@ def parse_listing(markdown: str, config: SiteConfig) -> list[dict]:
         return []
     
     articles = []
-    for m in re.finditer(config.listing_pattern, markdown, re.MULTILINE):
+    for m in compile_pattern(config.listing_pattern).finditer(markdown):
         groups = m.groups()
         article = {field: (groups[i].strip() if groups[i] else None)
                    for i, field in enumerate(config.listing_fields)}
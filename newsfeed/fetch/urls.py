@@ -0,0 +1,20 @@
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+                   "mc_cid", "mc_eid", "mkt_tok", "_hsenc", "_hsmi"}
+
+def canonicalize_url(url: str) -> str:
+    """Dedup key for an article URL: lowercase host, no tracking params, fragment, or trailing slash.
+
+    Only for comparing URLs; articles are fetched and stored under their original URL.
+    """
+    parts = urlsplit(url.strip())
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+def url_variants(url: str) -> set[str]:
+    """Forms an already-stored copy of this URL may have (raw, canonical, canonical with slash)."""
+    canonical = canonicalize_url(url)
+    return {url, canonical, canonical + "/"}
@@ -0,0 +1,198 @@
+"""Record/replay fixtures for the two network dependencies: r.jina.ai and Gemini.
+
+    NEWSFEED_FIXTURES=record   # pass through, saving every response
+    NEWSFEED_FIXTURES=replay   # serve saved responses, no network, no API key
+    NEWSFEED_FIXTURES_DIR=...  # store location (default benchmarks/fixtures)
+    NEWSFEED_REPLAY_LATENCY_JINA=0.8 NEWSFEED_REPLAY_LATENCY_LLM=2.5  # seconds per replayed call
+
+HTTP traffic is captured at the httpx transport made by fetch.client, Gemini
+calls at the client returned by llm.get_client, so everything above those
+(rate limits, retries, cost tracking) runs unchanged. Each response is one
+gzipped JSON file named by a hash of its request.
+"""
+import asyncio, gzip, hashlib, json, logging, os, threading, time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
+import httpx
+
+log = logging.getLogger("newsfeed.fixtures")
+
+MODE = os.environ.get("NEWSFEED_FIXTURES", "").lower()  # "", "record" or "replay"
+FIXTURES_DIR = Path(os.environ.get("NEWSFEED_FIXTURES_DIR",
+                                   Path(__file__).parent.parent / "benchmarks" / "fixtures"))
+LATENCY = {
+    "jina": float(os.environ.get("NEWSFEED_REPLAY_LATENCY_JINA", 0)),
+    "llm": float(os.environ.get("NEWSFEED_REPLAY_LATENCY_LLM", 0)),
+}
+KEPT_HEADERS = ("content-type", "etag", "last-modified")
+
+class FixtureMissing(LookupError):
+    """Replay found no recording for a request."""
+
+def recording() -> bool:
+    return MODE == "record"
+
+def replaying() -> bool:
+    return MODE == "replay"
+
+# ── Store ───────────────────────────────────────────────────
+
+class FixtureStore:
+    """Gzipped JSON fixtures under root/<kind>/<request hash>.json.gz."""
+
+    def __init__(self, root: Path = FIXTURES_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()[:40]
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.root / kind / f"{key}.json.gz"
+
+    def load(self, kind: str, key: str) -> Optional[dict]:
+        try:
+            with gzip.open(self._path(kind, key), "rt") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, kind: str, key: str, entry: dict):
+        path = self._path(kind, key)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with gzip.open(tmp, "wt") as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+
+store = FixtureStore()
+
+# ── HTTP (Jina Reader) ──────────────────────────────────────
+
+def _http_key(request: httpx.Request) -> str:
+    return store.key(request.method, str(request.url))
+
+def _record_http(request: httpx.Request, response: httpx.Response):
+    # A 304 only makes sense against a client-side cache; keep the full response instead
+    if response.status_code == 304 and store.load("jina", _http_key(request)): return
+    store.save("jina", _http_key(request), {
+        "url": str(request.url), "status": response.status_code, "text": response.text,
+        "headers": {k: v for k, v in response.headers.items() if k.lower() in KEPT_HEADERS},
+    })
+
+def _replay_http(request: httpx.Request) -> httpx.Response:
+    entry = store.load("jina", _http_key(request))
+    if entry is None:
+        log.warning(f"No fixture for {request.url}")
+        return httpx.Response(404, text="", request=request)
+    return httpx.Response(entry["status"], text=entry["text"], headers=entry["headers"], request=request)
+
+class RecordingTransport(httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport):
+        self.inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.inner.handle_request(request)
+        response.read()
+        _record_http(request, response)
+        return response
+
+    def close(self):
+        self.inner.close()
+
+class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        await response.aread()
+        _record_http(request, response)
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+class ReplayTransport(httpx.BaseTransport):
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if LATENCY["jina"]: time.sleep(LATENCY["jina"])
+        return _replay_http(request)
+
+class AsyncReplayTransport(httpx.AsyncBaseTransport):
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if LATENCY["jina"]: await asyncio.sleep(LATENCY["jina"])
+        return _replay_http(request)
+
+def wrap_transport(transport: httpx.BaseTransport) -> httpx.BaseTransport:
+    """The transport to use for `transport` under the current fixture mode."""
+    if replaying(): return ReplayTransport()
+    if recording(): return RecordingTransport(transport)
+    return transport
+
+def wrap_async_transport(transport: httpx.AsyncBaseTransport) -> httpx.AsyncBaseTransport:
+    if replaying(): return AsyncReplayTransport()
+    if recording(): return AsyncRecordingTransport(transport)
+    return transport
+
+# ── Gemini ──────────────────────────────────────────────────
+
+USAGE_FIELDS = ("prompt_token_count", "candidates_token_count", "total_token_count")
+
+def _llm_key(model: str, contents, config) -> str:
+    return store.key(model, contents, config)
+
+def _record_llm(model: str, contents, config, response):
+    usage = response.usage_metadata
+    store.save("llm", _llm_key(model, contents, config), {
+        "model": model, "text": response.text,
+        "usage": {f: getattr(usage, f, None) for f in USAGE_FIELDS},
+    })
+
+def _replay_llm(model: str, contents, config) -> SimpleNamespace:
+    entry = store.load("llm", _llm_key(model, contents, config))
+    if entry is None:
+        raise FixtureMissing(f"No fixture for {model} request ({len(str(contents))} chars)")
+    return SimpleNamespace(text=entry["text"], usage_metadata=SimpleNamespace(**entry["usage"]))
+
+class _RecordingModels:
+    def __init__(self, models):
+        self.models = models
+
+    def generate_content(self, model: str, contents, config=None):
+        response = self.models.generate_content(model=model, contents=contents, config=config)
+        _record_llm(model, contents, config, response)
+        return response
+
+class _AsyncRecordingModels:
+    def __init__(self, models):
+        self.models = models
+
+    async def generate_content(self, model: str, contents, config=None):
+        response = await self.models.generate_content(model=model, contents=contents, config=config)
+        _record_llm(model, contents, config, response)
+        return response
+
+class _ReplayModels:
+    def generate_content(self, model: str, contents, config=None):
+        if LATENCY["llm"]: time.sleep(LATENCY["llm"])
+        return _replay_llm(model, contents, config)
+
+class _AsyncReplayModels:
+    async def generate_content(self, model: str, contents, config=None):
+        if LATENCY["llm"]: await asyncio.sleep(LATENCY["llm"])
+        return _replay_llm(model, contents, config)
+
+class RecordingClient:
+    """Wraps a genai.Client, saving every generate_content response."""
+    def __init__(self, client):
+        self.models = _RecordingModels(client.models)
+        self.aio = SimpleNamespace(models=_AsyncRecordingModels(client.aio.models))
+
+class ReplayClient:
+    """Stands in for genai.Client, answering generate_content from the store."""
+    def __init__(self):
+        self.models = _ReplayModels()
+        self.aio = SimpleNamespace(models=_AsyncReplayModels())
@@ -0,0 +1,142 @@
+"""Postgres-backed queue for the long-running jobs.
+
+Endpoints `enqueue` a job and return at once; `python -m newsfeed.worker`
+processes run it. Jobs are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+any number of workers, on any number of machines, can share the table. A
+worker heartbeats the jobs it is running; a job whose heartbeat goes stale
+(the worker died) is requeued, or failed once it is out of attempts.
+"""
+import logging
+from datetime import date, timedelta
+from typing import Callable, Optional
+from sqlalchemy import func
+from newsfeed.storage.models import Job
+
+log = logging.getLogger("newsfeed.jobs")
+
+HEARTBEAT_INTERVAL = 30           # seconds between heartbeats from a worker
+STALE_AFTER = timedelta(minutes=5)  # no heartbeat for this long → worker presumed dead
+RETRY_DELAY = timedelta(minutes=1)  # before a failed job with attempts left runs again
+
+# ── Handlers ────────────────────────────────────────────────
+# kind → fn(**params), returning a JSON-able result or None. The kind doubles as
+# the admin job key, so job_<kind>_status keeps driving the admin jobs tab.
+
+def _date(value: Optional[str]) -> Optional[date]:
+    return date.fromisoformat(value) if value else None
+
+def run_pipeline(from_date=None, to_date=None, max_pages=5, parallel_sites=1):
+    from newsfeed.config import load_all_site_configs
+    from newsfeed.pipeline import run_sites
+    run_sites(load_all_site_configs(), parallel_sites, from_date=from_date, to_date=to_date, max_pages=max_pages)
+
+def run_category_summaries():
+    from newsfeed.scripts.category_summaries import run
+    run()
+
+def run_newsletter(from_date=None, to_date=None):
+    from newsfeed.scripts.create_newsletter import run
+    run(_date(from_date), _date(to_date))
+
+def run_keyword_summaries():
+    from newsfeed.storage.database import get_session
+    from newsfeed.web.scripts.keyword_summarizer import run_once
+    db = get_session()
+    try:
+        return {"processed": run_once(db)}
+    finally:
+        db.close()
+
+def run_backfill(limit=None, since=None, concurrency=4):
+    from newsfeed.backfill import run_backfill as backfill
+    return backfill(limit=limit, since=_date(since), concurrency=concurrency)
+
+HANDLERS: dict[str, Callable] = {
+    "pipeline": run_pipeline,
+    "category_summarizer": run_category_summaries,
+    "newsletter_creator": run_newsletter,
+    "keyword_summarizer": run_keyword_summaries,
+    "backfill": run_backfill,
+}
+
+# ── Queue ───────────────────────────────────────────────────
+
+def enqueue(db, kind: str, max_attempts: int = 1, **params) -> int:
+    """Queue a job and return its id; an identical job still waiting in the queue is reused."""
+    if kind not in HANDLERS: raise ValueError(f"Unknown job kind: {kind}")
+    params = {k: v for k, v in params.items() if v is not None}
+    existing = db.query(Job).filter(Job.status == "queued", Job.kind == kind, Job.params == params).first()
+    if existing:
+        _update_job_setting(db, existing)
+        return existing.id
+    job = Job(kind=kind, params=params, max_attempts=max_attempts)
+    db.add(job)
+    db.commit()
+    _update_job_setting(db, job)
+    log.info(f"Queued job {job.id} ({kind}) {params}")
+    return job.id
+
+def claim(db, worker: str) -> Optional[Job]:
+    """Take the oldest runnable job, skipping rows other workers have locked; None if there is none."""
+    job = (db.query(Job)
+           .filter(Job.status == "queued", Job.run_after <= func.now())
+           .order_by(Job.run_after, Job.id)
+           .with_for_update(skip_locked=True)
+           .first())
+    if job is None:
+        db.rollback()
+        return None
+    job.status, job.locked_by, job.attempts = "running", worker, job.attempts + 1
+    job.started_at = job.heartbeat_at = func.now()
+    job.error = None
+    db.commit()
+    _update_job_setting(db, job)
+    return job
+
+def _settle(job: Job, result=None, error: Optional[str] = None):
+    """Apply a run's outcome: done, requeued for another attempt, or failed."""
+    job.locked_by, job.error = None, error
+    if error is None:
+        job.status, job.result = "done", result
+    elif job.attempts < job.max_attempts:
+        job.status = "queued"
+        job.run_after = func.now() + RETRY_DELAY * job.attempts
+        return
+    else:
+        job.status = "failed"
+    job.finished_at = func.now()
+
+def finish(db, job_id: int, result=None, error: Optional[str] = None):
+    """Record the outcome of a job this worker ran."""
+    job = db.get(Job, job_id)
+    _settle(job, result, error)
+    db.commit()
+    _update_job_setting(db, job)
+
+def heartbeat(db, job_ids):
+    """Mark jobs as still alive."""
+    if not job_ids: return
+    (db.query(Job).filter(Job.id.in_(job_ids), Job.status == "running")
+     .update({Job.heartbeat_at: func.now()}, synchronize_session=False))
+    db.commit()
+
+def requeue_stale(db) -> int:
+    """Settle running jobs whose worker stopped heartbeating; returns how many."""
+    stale = (db.query(Job)
+             .filter(Job.status == "running", Job.heartbeat_at < func.now() - STALE_AFTER)
+             .with_for_update(skip_locked=True)
+             .all())
+    for job in stale:
+        log.warning(f"Job {job.id} ({job.kind}): worker {job.locked_by} stopped heartbeating")
+        _settle(job, error=f"worker {job.locked_by} stopped heartbeating")
+    db.commit()
+    for job in stale:
+        _update_job_setting(db, job)
+    return len(stale)
+
+def _update_job_setting(db, job: Job):
+    """Mirror a job's state into the job_<kind>_* settings the admin jobs tab shows."""
+    from newsfeed.web.queries.admin import set_job_running, set_job_queued, set_job_complete
+    if job.status == "running": set_job_running(db, job.kind)
+    elif job.status == "queued": set_job_queued(db, job.kind)
+    else: set_job_complete(db, job.kind, success=job.status == "done", error=job.error or "")
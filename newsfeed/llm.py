@@ -0,0 +1,164 @@
+"""LLM gateway — one shared Gemini client, per-model RPM/TPM limits, retries."""
+import os, random, asyncio, logging, threading, time
+from dataclasses import dataclass
+from typing import Optional
+import httpx
+from google import genai
+from google.genai import errors
+from newsfeed import fixtures
+from newsfeed.config import DEFAULT_MODEL, MODEL_RATE_LIMITS, DEFAULT_RATE_LIMIT
+from newsfeed.cost import track_usage
+from newsfeed.ratelimit import TokenBucket
+
+log = logging.getLogger("newsfeed.llm")
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+OUTPUT_TOKEN_ESTIMATE = 512  # reserved per call until the real count is known
+
+@dataclass
+class LLMResponse:
+    text: str
+    input_tokens: int
+    output_tokens: int
+    model: str
+
+class LLMError(Exception):
+    """Generation failed; `retryable` says whether trying again later could succeed."""
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
+# ── Client ──────────────────────────────────────────────────
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client() -> genai.Client:
+    """Process-wide Gemini client (wrapped or replaced under NEWSFEED_FIXTURES)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            if fixtures.replaying():
+                _client = fixtures.ReplayClient()
+                return _client
+            api_key = os.environ.get("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_API_KEY not set in environment")
+            _client = genai.Client(api_key=api_key)
+            if fixtures.recording(): _client = fixtures.RecordingClient(_client)
+        return _client
+
+# ── Rate Limits ─────────────────────────────────────────────
+
+class ModelLimiter:
+    """Requests-per-minute and tokens-per-minute buckets for one model."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rate=rpm / 60, capacity=rpm)
+        self.tokens = TokenBucket(rate=tpm / 60, capacity=tpm)
+
+    def reserve(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens; return how long to wait for both."""
+        return max(self.requests.reserve(1), self.tokens.reserve(tokens))
+
+    def settle(self, estimated: int, actual: int):
+        """Correct the token bucket once the response reports real usage."""
+        self.tokens.adjust(actual - estimated)
+
+    def back_off(self, seconds: float):
+        """Empty the request bucket so every caller of this model waits `seconds` (quota hit)."""
+        self.requests.pause(seconds)
+
+_limiters: dict[str, ModelLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def limiter(model: str) -> ModelLimiter:
+    with _limiters_lock:
+        if model not in _limiters:
+            _limiters[model] = ModelLimiter(**MODEL_RATE_LIMITS.get(model, DEFAULT_RATE_LIMIT))
+        return _limiters[model]
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token) used to reserve TPM budget."""
+    return max(1, len(text) // 4)
+
+# ── Error Classification ────────────────────────────────────
+
+def _retry_after(error: errors.APIError) -> Optional[float]:
+    """Server-suggested delay from a RetryInfo detail ("retryDelay": "38s"), if any."""
+    details = error.details.get("error", {}).get("details", []) if isinstance(error.details, dict) else []
+    for detail in details:
+        delay = detail.get("retryDelay", "") if isinstance(detail, dict) else ""
+        if delay.endswith("s"):
+            try: return float(delay[:-1])
+            except ValueError: pass
+    return None
+
+def classify(error: Exception) -> tuple[bool, Optional[float]]:
+    """(retryable, suggested delay) for an exception raised by a generate call."""
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS, _retry_after(error)
+    if isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError)):
+        return True, None
+    return False, None
+
+def _backoff(error: Exception, attempt: int, base: float, model: str) -> float:
+    """Delay before retrying this caller. A server hint is applied to the whole model instead."""
+    hint = classify(error)[1]
+    if hint is not None:
+        limiter(model).back_off(hint)
+        return 0.0
+    return base * 2 ** (attempt - 1) * random.uniform(0.8, 1.2)
+
+# ── Generate ────────────────────────────────────────────────
+
+def _response(response, model: str, estimated: int) -> LLMResponse:
+    usage = response.usage_metadata
+    input_tok = getattr(usage, 'prompt_token_count', None) or 0
+    output_tok = getattr(usage, 'candidates_token_count', None) or 0
+    limiter(model).settle(estimated, input_tok + output_tok)
+    track_usage(input_tok, output_tok, model)
+    return LLMResponse(response.text or "", input_tok, output_tok, model)
+
+def _give_up(error: Exception, attempt: int, max_retries: int, model: str) -> Optional[LLMError]:
+    """LLMError to raise if this failure is final, else None (caller retries)."""
+    retryable, _ = classify(error)
+    if retryable and attempt < max_retries:
+        log.warning(f"{model} attempt {attempt}/{max_retries} failed, retrying: {error}")
+        return None
+    return LLMError(f"{model} failed after {attempt} attempt(s): {error}", retryable)
+
+def generate(prompt: str, model: str = None, config: dict = None,
+             max_retries: int = 3, retry_delay: float = 2.0) -> LLMResponse:
+    """Rate-limited generate_content with retries on transient errors. Raises LLMError."""
+    if model is None: model = DEFAULT_MODEL
+    estimated = estimate_tokens(prompt) + OUTPUT_TOKEN_ESTIMATE
+    for attempt in range(1, max_retries + 1):
+        wait = limiter(model).reserve(estimated)
+        if wait: time.sleep(wait)
+        try:
+            response = get_client().models.generate_content(model=model, contents=prompt, config=config or {})
+            return _response(response, model, estimated)
+        except Exception as e:
+            limiter(model).settle(estimated, 0)
+            error = _give_up(e, attempt, max_retries, model)
+            if error: raise error from e
+            time.sleep(_backoff(e, attempt, retry_delay, model))
+
+async def agenerate(prompt: str, model: str = None, config: dict = None,
+                    max_retries: int = 3, retry_delay: float = 2.0) -> LLMResponse:
+    """Async variant of generate; waits on the model's buckets without blocking the loop."""
+    if model is None: model = DEFAULT_MODEL
+    estimated = estimate_tokens(prompt) + OUTPUT_TOKEN_ESTIMATE
+    for attempt in range(1, max_retries + 1):
+        wait = limiter(model).reserve(estimated)
+        if wait: await asyncio.sleep(wait)
+        try:
+            response = await get_client().aio.models.generate_content(model=model, contents=prompt,
+                                                                      config=config or {})
+            return _response(response, model, estimated)
+        except Exception as e:
+            limiter(model).settle(estimated, 0)
+            error = _give_up(e, attempt, max_retries, model)
+            if error: raise error from e
+            await asyncio.sleep(_backoff(e, attempt, retry_delay, model))
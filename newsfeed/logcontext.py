@@ -0,0 +1,17 @@
+"""Per-site logging context: records carry the site whose run emitted them."""
+import logging
+from contextvars import ContextVar
+
+LOG_FORMAT = "%(asctime)s [%(name)s]%(site)s %(message)s"
+
+current_site: ContextVar[str] = ContextVar("current_site", default="")
+
+_base_factory = logging.getLogRecordFactory()
+
+def _record_factory(*args, **kwargs) -> logging.LogRecord:
+    record = _base_factory(*args, **kwargs)
+    site = current_site.get()
+    record.site = f" <{site}>" if site else ""
+    return record
+
+logging.setLogRecordFactory(_record_factory)
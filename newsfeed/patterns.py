@@ -0,0 +1,90 @@
+"""Site-config regexes: compiled once, matched under a per-match time budget.
+
+Patterns run on RE2 (google-re2) when it is installed and supports the syntax:
+RE2 matches in linear time, so a pathological page cannot trigger catastrophic
+backtracking. Patterns RE2 rejects (lookarounds, backreferences) fall back to
+the stdlib engine. Either way each match is timed; a match slower than
+MATCH_BUDGET is logged and counted in `overruns` (for the process) and in the
+current run's counter (see reset_run_overruns), but its result is still used:
+the budget flags slow patterns, it never drops matches.
+"""
+import logging, re, threading, time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Iterator, Optional
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+log = logging.getLogger("newsfeed.patterns")
+
+MATCH_BUDGET = 0.05  # seconds per match
+
+overruns: Counter = Counter()  # pattern → matches that blew the budget, since process start
+_run_overruns: ContextVar[Optional[Counter]] = ContextVar("newsfeed_pattern_overruns", default=None)
+_overrun_lock = threading.Lock()
+
+def reset_run_overruns():
+    """Start a fresh overrun counter for the current context (call at start of each run)."""
+    _run_overruns.set(Counter())
+
+def run_overruns() -> Counter:
+    """Overruns counted since the current context's reset_run_overruns."""
+    with _overrun_lock:
+        return Counter(_run_overruns.get() or {})
+
+def _inline_flags(flags: int) -> str:
+    """re flags as an inline group, the form RE2 takes them in."""
+    letters = "".join(c for flag, c in ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+                      if flags & flag)
+    return f"(?{letters})" if letters else ""
+
+class SafePattern:
+    """A compiled site pattern with budgeted search/finditer."""
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.compiled = re.compile(pattern, flags)  # raises re.error on invalid syntax
+        self.engine = "re"
+        if re2 is not None:
+            try:
+                self.compiled = re2.compile(_inline_flags(flags) + pattern)
+                self.engine = "re2"
+            except Exception:
+                log.warning(f"Pattern not supported by RE2, using backtracking engine: {pattern[:80]}")
+
+    @property
+    def groups(self) -> int:
+        return self.compiled.groups
+
+    def _check_budget(self, elapsed: float):
+        if elapsed <= MATCH_BUDGET: return
+        with _overrun_lock:
+            overruns[self.pattern] += 1
+            run = _run_overruns.get()
+            if run is not None: run[self.pattern] += 1
+        log.warning(f"Pattern exceeded {MATCH_BUDGET * 1000:.0f}ms budget ({elapsed * 1000:.0f}ms, "
+                    f"{self.engine}): {self.pattern[:80]}")
+
+    def search(self, text: str) -> Optional[re.Match]:
+        start = time.perf_counter()
+        m = self.compiled.search(text)
+        self._check_budget(time.perf_counter() - start)
+        return m
+
+    def finditer(self, text: str) -> Iterator[re.Match]:
+        matches = self.compiled.finditer(text)
+        while True:
+            start = time.perf_counter()
+            m = next(matches, None)
+            self._check_budget(time.perf_counter() - start)
+            if m is None: return
+            yield m
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str, flags: int = re.MULTILINE) -> SafePattern:
+    """Compiled SafePattern for a config regex (cached; site patterns default to MULTILINE)."""
+    return SafePattern(pattern, flags)
@@ -1,46 +1,189 @@
-"""Full pipeline orchestrator: fetch → process → store → report."""
+"""Full pipeline orchestrator: fetch → process → store → report.
 
-import logging
+The stages are streamed: fetched articles flow through a bounded hand-off queue
+into the processing pool and on to batched saves, so memory stays flat and the
+first articles are stored while later pages are still being fetched.
+"""
+
+import contextvars, logging, queue, threading, time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator
 from newsfeed.config import load_site_config, load_state, save_state
 from newsfeed.fetch import fetch_new_articles
 from newsfeed.processing import process_article
-from newsfeed.storage.repository import save_article, update_source_health, save_pipeline_run
+from newsfeed.storage.database import get_session
+from newsfeed.storage.repository import save_articles, update_source_health, save_pipeline_run
 from newsfeed.cost import get_daily_cost, reset_daily_usage
+from newsfeed.logcontext import current_site
+from newsfeed.patterns import reset_run_overruns, run_overruns
 
 log = logging.getLogger("newsfeed.pipeline")
 
+SAVE_BATCH_SIZE = 50
+SAVE_INTERVAL = 5.0  # seconds; flush a partial batch rather than hold it longer
+
 def report():
     """Cost reporting."""
     cost = get_daily_cost()
     log.info(f"Cost: ${cost['total_cost']:.6f} ({cost['input_tokens']} in, {cost['output_tokens']} out)")
+    log.info(f"Summary cache: {cost['cache_hits']} hits, {cost['cache_misses']} misses")
+    overruns = run_overruns()
+    if overruns: log.warning(f"Patterns over match budget this run: {dict(overruns)}")
     return cost
 
-def run(site_name, from_date=None, to_date=None, max_pages=5, no_verify_ssl=False):
+def process_concurrently(articles: Iterable[dict], config, workers: int) -> Iterator[dict]:
+    """Run process_article over `articles` on `workers` threads, yielding results in input order.
+
+    At most 2 × workers articles are in flight, so a slow consumer (e.g. the
+    batched save) throttles submission instead of results piling up in memory.
+    """
+    def process(article):
+        return process_article(dict(article), config) if article.get("content") else article
+
+    window = max(1, workers) * 2
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=f"process-{config.name}") as pool:
+        pending = deque()
+        for article in articles:
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            # Each task runs in a copy of the caller's context so context-scoped state follows it
+            pending.append(pool.submit(contextvars.copy_context().run, process, article))
+        while pending:
+            yield pending.popleft().result()
+
+_DONE = object()
+
+def with_ticks(items: Iterable, tick: float) -> Iterator:
+    """Yield from `items`, plus None whenever `tick` seconds pass without one.
+
+    `items` is consumed on a helper thread (in a copy of the caller's context),
+    so the caller can act on time — e.g. flush a partial batch — while the next
+    item is still being fetched or processed. Errors are re-raised here.
+    """
+    out, stop, error = queue.Queue(maxsize=1), threading.Event(), []
+
+    def produce():
+        try:
+            for item in items:
+                while not stop.is_set():
+                    try:
+                        out.put(item, timeout=tick)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set(): break
+        except BaseException as e:
+            error.append(e)
+        finally:
+            if hasattr(items, "close"): items.close()
+            out.put(_DONE)
+
+    ctx = contextvars.copy_context()
+    thread = threading.Thread(target=ctx.run, args=(produce,), name="pipeline-stream", daemon=True)
+    thread.start()
+    done = False
+    try:
+        while not done:
+            try:
+                item = out.get(timeout=tick)
+            except queue.Empty:
+                yield None
+                continue
+            done = item is _DONE
+            if not done: yield item
+    finally:
+        if not done:
+            # Unblock the producer and wait for it to wind down its in-flight work
+            stop.set()
+            while out.get() is not _DONE: pass
+        thread.join()
+    if error: raise error[0]
+
+def run(site_name, from_date=None, to_date=None, max_pages=5, no_verify_ssl=False, backfill=True,
+        historical=False):
     config = load_site_config(site_name)
     if no_verify_ssl:
         config.verify_ssl = False
     state = load_state(site_name)
     reset_daily_usage()
+    reset_run_overruns()
 
     log.info(f"=== Running {config.name} ===")
-    articles = fetch_new_articles(config, state, from_date=from_date, to_date=to_date, max_pages=max_pages)
-
-    saved, failed = 0, 0
-    for a in articles:
-        processed = process_article(dict(a), config) if a.get("content") else a
-        if save_article(processed, config.name, config.listing_url):
-            saved += 1
-        else:
-            failed += 1
-
-    update_source_health(config.name, success=(failed == 0))
-    save_state(state)
-    cost = report()
-    save_pipeline_run(config.name, len(articles), cost)
-    log.info(f"=== {config.name}: {len(articles)} fetched, {saved} saved, {failed} failed ===")
-
-    # Auto-heal: backfill any articles missing summaries or tags
+    articles = fetch_new_articles(config, state, from_date=from_date, to_date=to_date, max_pages=max_pages,
+                                  historical=historical)
+
+    totals = {"fetched": 0, "saved": 0, "duplicates": 0, "failed": 0, "partial": 0}
+    db = get_session()
+
+    def flush(batch):
+        result = save_articles(batch, config.name, config.listing_url, db=db)
+        totals["saved"] += result["saved"]
+        totals["duplicates"] += result["duplicates"]
+        totals["failed"] += len(result["failed"])
+        totals["partial"] += len({url for url, _ in result["partial"]})
+
+    try:
+        # Save ordered results in batches while later articles are still being fetched/processed.
+        # Ticks (None) wake the loop during gaps between articles, so a partial batch is still
+        # saved within SAVE_INTERVAL; saves stay on this thread, which owns `db`.
+        batch, last_flush = [], time.monotonic()
+        for article in with_ticks(process_concurrently(articles, config, config.process_workers),
+                                  tick=min(1.0, SAVE_INTERVAL)):
+            if article is not None:
+                totals["fetched"] += 1
+                batch.append(article)
+            if len(batch) >= SAVE_BATCH_SIZE or (batch and time.monotonic() - last_flush >= SAVE_INTERVAL):
+                flush(batch)
+                batch, last_flush = [], time.monotonic()
+        flush(batch)
+
+        update_source_health(config.name, success=(totals["failed"] == 0), db=db)
+        # Only a fully saved run may let the next one short-circuit on an unchanged page 1
+        if totals["failed"]: state.listing_urls.clear()
+        save_state(state, db=db)
+        cost = report()
+        save_pipeline_run(config.name, totals["fetched"], cost, db=db)
+    finally:
+        db.close()
+    log.info(f"=== {config.name}: {totals['fetched']} fetched, {totals['saved']} saved "
+             f"({totals['partial']} left for backfill), "
+             f"{totals['duplicates']} duplicates, {totals['failed']} failed ===")
+
+    if backfill: run_auto_heal()
+
+def run_auto_heal():
+    """Backfill any articles missing summaries or tags."""
     from newsfeed.backfill import run_backfill
     log.info("=== Running auto-heal backfill ===")
     backfill_result = run_backfill()
     log.info(f"=== Backfill: {backfill_result['summaries_fixed']} summaries, {backfill_result['tags_fixed']} tags fixed ===")
+
+# ── Multiple Sites ──────────────────────────────────────────
+
+def _run_in_site_context(site_name, **kwargs):
+    """Run one site with its name on every log record and its own cost counters."""
+    current_site.set(site_name)
+    run(site_name, backfill=False, **kwargs)
+
+def run_sites(site_names, parallel_sites=1, **kwargs):
+    """Run each site, up to `parallel_sites` at once, then one auto-heal backfill.
+
+    Sites run on threads, each in a fresh copy of the caller's context, so log
+    lines and cost accounting stay per-site while rate limiters (per-host, per-model
+    and the global r.jina.ai cap) remain shared. A failing site doesn't stop the
+    others; failures are raised together once every site has finished.
+    """
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, parallel_sites), thread_name_prefix="site") as pool:
+        futures = {pool.submit(contextvars.copy_context().run, _run_in_site_context, name, **kwargs): name
+                   for name in site_names}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                log.exception(f"=== {futures[future]} failed: {e} ===")
+                errors[futures[future]] = e
+    run_auto_heal()
+    if errors:
+        raise RuntimeError(f"{len(errors)} site(s) failed: " + "; ".join(f"{k}: {v}" for k, v in errors.items()))
@@ -1,28 +1,60 @@
 import re, html
 
+# Patterns are compiled once; each transform also skips its scan entirely when a
+# literal every match must contain is absent from the text.
+
+MONTHS = "January|February|March|April|May|June|July|August|September|October|November|December"
+BYLINE_RE = re.compile(rf'^(?:{MONTHS})\s+\d{{1,2}},\s+\d{{4}}\s+By.+$', re.MULTILINE)
+LINK_RE = re.compile(r'\[([^\]]*)\]\([^)]+\)')
+IMAGE_RE = re.compile(r'!\[[^\]]*\]\([^)]+\)')
+CAPTION_RE = re.compile(r'^–\s+.{1,30}$', re.MULTILINE)
+BLANK_RUN_RE = re.compile(r'\n{3,}')
+
 def decode_entities(text: str) -> str:
     """Decode HTML entities like &#x27; → '"""
     return html.unescape(text)
 
 def normalize_whitespace(text: str) -> str:
     """Collapse 3+ blank lines to 2, strip trailing spaces."""
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r'[ \t]+$', '', text, flags=re.MULTILINE)
+    text = BLANK_RUN_RE.sub('\n\n', text)
+    # Per-line rstrip is the same as re.sub(r'[ \t]+$', '', re.MULTILINE), minus the regex scan
+    if ' \n' in text or '\t\n' in text:
+        text = '\n'.join(line.rstrip(' \t') for line in text.split('\n'))
     return text.strip()
 
 def strip_links(text: str) -> str:
     """Convert [text](url) → text, remove bare [](url)."""
-    return re.sub(r'\[([^\]]*)\]\([^)]+\)', r'\1', text)
+    if '](' not in text: return text
+    return LINK_RE.sub(r'\1', text)
 
 def strip_images(text: str) -> str:
     """Remove ![alt](url) image tags and standalone captions like '– Google Maps'."""
-    text = re.sub(r'!\[[^\]]*\]\([^)]+\)', '', text)
-    text = re.sub(r'^–\s+.{1,30}$', '', text, flags=re.MULTILINE)
+    if '![' in text: text = IMAGE_RE.sub('', text)
+    if '\n–' in text or text.startswith('–'): text = CAPTION_RE.sub('', text)
     return text
 
 def strip_byline(text: str) -> str:
     """Remove byline line like 'February 19, 2026 ByDan SwinhoeHave your say'."""
-    return re.sub(
-        r'^(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},\s+\d{4}\s+By.+$',
-        '', text, count=1, flags=re.MULTILINE
-    )
+    if 'By' not in text: return text
+    return BYLINE_RE.sub('', text, count=1)
+
+# ── Fusion ──────────────────────────────────────────────────
+# Pure str → str transforms of article content. process_article fuses
+# consecutive runs of these into a single step over one local string.
+
+TEXT_TRANSFORMS = {
+    "strip_byline": strip_byline,
+    "strip_links": strip_links,
+    "strip_images": strip_images,
+    "decode_entities": decode_entities,
+    "normalize_whitespace": normalize_whitespace,
+}
+
+def fuse_transforms(names: list[str]):
+    """Compose a run of TEXT_TRANSFORMS into one str → str function."""
+    kernels = tuple(TEXT_TRANSFORMS[n] for n in names)
+    def fused(text: str) -> str:
+        for kernel in kernels:
+            text = kernel(text)
+        return text
+    return fused
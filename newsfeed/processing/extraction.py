@@ -1,5 +1,6 @@
 import re
 from typing import Optional
+from newsfeed.patterns import compile_pattern
 
 def extract_jina_meta(raw: str) -> dict:
     """Parse Jina header: Title, URL Source, and body after 'Markdown Content:'."""
@@ -18,10 +19,10 @@ def extract_body_by_markers(text: str, start_marker: Optional[str] = None, end_m
     start_idx = 0
     end_idx = len(text)
     if start_marker:
-        m = re.search(start_marker, text, re.MULTILINE)
+        m = compile_pattern(start_marker).search(text)
         if m: start_idx = m.start()
     if end_marker:
-        m = re.search(end_marker, text[start_idx:], re.MULTILINE)
+        m = compile_pattern(end_marker).search(text[start_idx:])
         if m: end_idx = start_idx + m.start()
     return text[start_idx:end_idx].strip()
 
@@ -1,47 +1,91 @@
 import re
+from functools import lru_cache
 
-def is_nav_block(lines: list[str], threshold: int = 5) -> list[tuple[int, int]]:
+# ── Line Classification ─────────────────────────────────────
+# Every line is classified once into a bitmask of features; the block
+# detectors below are run-length scans over that array.
+
+BULLET_LINK = 1    # "* [text](url)" nav item
+LINK        = 2    # line is (mostly) a markdown link
+FORM        = 4    # form field, checkbox, dial code, submit button
+COOKIE      = 8    # cookie/consent/privacy text
+SHARE       = 16   # row of 3+ social share links
+BLANK       = 32
+SITE        = 64   # matches one of the site's noise_patterns
+
+BULLET_LINK_RE = re.compile(r'\s*\*\s+\[')
+LINK_RE = re.compile(r'\[.*\]\(.*\)|\*\s+\[')
+# Form lines: a bare field label, a dial code like "(+351)", a checkbox, a submit button.
+# Each alternative has a cheap literal/length gate in classify_line.
+FORM_LABEL_RE = re.compile(r'(Nome|Email|Telefone|Empresa|Segmento)\*?|Submit|Iniciar a conversa', re.IGNORECASE)
+FORM_LABEL_MAX = len("Iniciar a conversa")
+DIAL_CODE_RE = re.compile(r'\(?\+\d{1,4}\)\s*$')
+CHECKBOX_RE = re.compile(r'- \[[ x]\]', re.IGNORECASE)
+COOKIE_WORDS = ("cookie", "consent", "privac", "aceitar", "recusar")
+SHARE_RE = re.compile(r'\[(Facebook|Twitter|LinkedIn|Reddit|Email|Share)\]', re.IGNORECASE)
+
+@lru_cache(maxsize=None)
+def compile_site_rules(patterns: tuple[str, ...]):
+    """Combine a site's noise_patterns into one regex (None if there are none)."""
+    if not patterns: return None
+    return re.compile('|'.join(f'(?:{p})' for p in patterns))
+
+def classify_line(line: str, site_rule=None) -> int:
+    """Feature bitmask for one line."""
+    stripped = line.strip()
+    if not stripped: return BLANK
+    flags = 0
+    if '[' in line:
+        if BULLET_LINK_RE.match(line): flags |= BULLET_LINK
+        if LINK_RE.match(stripped): flags |= LINK
+        if len(SHARE_RE.findall(line)) >= 3: flags |= SHARE
+    if ((len(stripped) <= FORM_LABEL_MAX and FORM_LABEL_RE.fullmatch(stripped))
+            or ('+' in line and DIAL_CODE_RE.search(line))
+            or ('- [' in line and CHECKBOX_RE.search(line))):
+        flags |= FORM
+    lowered = line.lower()
+    if any(word in lowered for word in COOKIE_WORDS): flags |= COOKIE
+    if site_rule is not None and site_rule.search(line): flags |= SITE
+    return flags
+
+def classify_lines(lines: list[str], site_rule=None) -> list[int]:
+    return [classify_line(line, site_rule) for line in lines]
+
+# ── Block Detectors ─────────────────────────────────────────
+
+def is_nav_block(flags: list[int], threshold: int = 5) -> list[tuple[int, int]]:
     """Find blocks of 5+ consecutive bullet-point links (nav menus)."""
     blocks, start, count = [], None, 0
-    for i, line in enumerate(lines):
-        if re.match(r'\s*\*\s+\[', line):
+    for i, f in enumerate(flags):
+        if f & BULLET_LINK:
             if start is None: start = i
             count += 1
         else:
             if count >= threshold: blocks.append((start, i - 1))
             start, count = None, 0
-    if count >= threshold: blocks.append((start, len(lines) - 1))
+    if count >= threshold: blocks.append((start, len(flags) - 1))
     return blocks
 
-def is_link_cluster(lines: list[str], threshold: int = 4) -> list[tuple[int, int]]:
+def is_link_cluster(flags: list[int], threshold: int = 4) -> list[tuple[int, int]]:
     """Find blocks of consecutive lines that are mostly links with no paragraph text."""
     blocks, start, count = [], None, 0
-    for i, line in enumerate(lines):
-        stripped = line.strip()
-        if stripped and (re.match(r'\[.*\]\(.*\)', stripped) or re.match(r'\*\s+\[', stripped)):
+    for i, f in enumerate(flags):
+        if f & LINK:
             if start is None: start = i
             count += 1
-        elif stripped == '':
+        elif f & BLANK:
             continue
         else:
             if count >= threshold: blocks.append((start, i - 1))
             start, count = None, 0
-    if count >= threshold: blocks.append((start, len(lines) - 1))
+    if count >= threshold: blocks.append((start, len(flags) - 1))
     return blocks
 
-def is_form_block(lines: list[str]) -> list[tuple[int, int]]:
+def is_form_block(flags: list[int]) -> list[tuple[int, int]]:
     """Detect form regions (inputs, dropdowns, checkboxes, country lists)."""
-    form_patterns = re.compile(
-        r'(^\s*(Nome|Email|Telefone|Empresa|Segmento)\*?\s*$)'
-        r'|(\(?\+\d{1,4}\)\s*$)'
-        r'|(- \[[ x]\])'
-        r'|(^\s*Submit\s*$)'
-        r'|(^\s*Iniciar a conversa\s*$)',
-        re.IGNORECASE
-    )
     blocks, start, form_line_count, total_count = [], None, 0, 0
-    for i, line in enumerate(lines):
-        if form_patterns.search(line):
+    for i, f in enumerate(flags):
+        if f & FORM:
             if start is None: start = i
             form_line_count += 1
             total_count += 1
@@ -50,32 +94,19 @@ def is_form_block(lines: list[str]) -> list[tuple[int, int]]:
             if start is not None and form_line_count < 2 and (total_count - form_line_count) > 3:
                 if form_line_count >= 3: blocks.append((start, i - 1))
                 start, form_line_count, total_count = None, 0, 0
-    if form_line_count >= 3: blocks.append((start, len(lines) - 1))
+    if form_line_count >= 3: blocks.append((start, len(flags) - 1))
     return blocks
 
-def is_cookie_banner(line: str) -> bool:
-    """Detect cookie/consent banner lines."""
-    return bool(re.search(r'cookie|consent|privac|aceitar|recusar', line, re.IGNORECASE))
-
-def is_share_row(line: str) -> bool:
-    """Detect social share link rows."""
-    social = re.findall(r'\[(Facebook|Twitter|LinkedIn|Reddit|Email|Share)\]', line, re.IGNORECASE)
-    return len(social) >= 3
-
-def remove_noise(text: str) -> str:
+def remove_noise(text: str, site_patterns: list[str] = ()) -> str:
     """Remove all detected noise blocks from markdown text."""
     lines = text.split('\n')
-
-    noise_ranges = []
-    noise_ranges.extend(is_nav_block(lines))
-    noise_ranges.extend(is_link_cluster(lines))
-    noise_ranges.extend(is_form_block(lines))
+    flags = classify_lines(lines, compile_site_rules(tuple(site_patterns)))
 
     noise_lines = set()
-    for start, end in noise_ranges:
+    for start, end in is_nav_block(flags) + is_link_cluster(flags) + is_form_block(flags):
         noise_lines.update(range(start, end + 1))
-    for i, line in enumerate(lines):
-        if is_cookie_banner(line) or is_share_row(line):
+    for i, f in enumerate(flags):
+        if f & (COOKIE | SHARE | SITE):
             noise_lines.add(i)
 
     cleaned = [line for i, line in enumerate(lines) if i not in noise_lines]
@@ -1,9 +1,12 @@
 import logging
-from newsfeed.config import SiteConfig
+from newsfeed.config import SiteConfig, DEFAULT_MODEL
 from .noise import remove_noise
 from .extraction import extract_jina_meta, extract_body_by_markers, extract_body_by_heuristic
-from .cleanup import decode_entities, normalize_whitespace, strip_links, strip_images, strip_byline
-from .summarization import summarize
+from .cleanup import (
+    decode_entities, normalize_whitespace, strip_links, strip_images, strip_byline,
+    TEXT_TRANSFORMS, fuse_transforms,
+)
+from .summarization import summarize, cached_summary, SUMMARY_PROMPT_VERSION
 from .tagging import auto_tag
 
 log = logging.getLogger("newsfeed.processing")
@@ -38,7 +41,7 @@ def _tool_extract_body(article: dict, config: SiteConfig) -> dict:
 
 @register_tool("remove_noise")
 def _tool_remove_noise(article: dict, config: SiteConfig) -> dict:
-    article["content"] = remove_noise(article["content"])
+    article["content"] = remove_noise(article["content"], config.noise_patterns)
     return article
 
 @register_tool("decode_entities")
@@ -69,13 +72,20 @@ def _tool_strip_byline(article: dict, config: SiteConfig) -> dict:
 
 @register_tool("summarize")
 def _tool_summarize(article: dict, config) -> dict:
-    result = summarize(article.get("content", ""), url=article.get("url", ""))
+    content = article.get("content", "")
+    result = cached_summary(content)
+    if result is not None:
+        log.info(f"Summary cache hit for: {article.get('url', 'unknown')}")
+    else:
+        result = summarize(content, url=article.get("url", ""))
     if result is None:
         log.warning(f"Summarization failed for: {article.get('url', 'unknown')}")
         article["summary_failed"] = True
     else:
         article["subtitle"] = result.get("subtitle", "")
         article["bullets"] = result.get("bullets", [])
+        article["summary_model"] = DEFAULT_MODEL
+        article["prompt_version"] = SUMMARY_PROMPT_VERSION
     return article
 
 @register_tool("auto_tag")
@@ -85,14 +95,45 @@ def _tool_auto_tag(article: dict, config) -> dict:
 
 # ── Pipeline Runner ─────────────────────────────────────────
 
-def process_article(article: dict, config: SiteConfig, pipeline: list[str] = None) -> dict:
-    """Run an article through the processing pipeline."""
-    if pipeline is None:
-        pipeline = config.pipeline
-    for tool_name in pipeline:
+_compiled: dict[tuple[str, ...], list] = {}
+
+def _fused_tool(names: list[str]):
+    """One tool for a run of pure text transforms: content is rewritten once."""
+    transform = fuse_transforms(names)
+    decode_title = "decode_entities" in names
+    def tool(article: dict, config: SiteConfig) -> dict:
+        article["content"] = transform(article["content"])
+        if decode_title: article["title"] = decode_entities(article.get("title", ""))
+        return article
+    return tool
+
+def compile_pipeline(pipeline: list[str]) -> list:
+    """Resolve tool names, fusing consecutive TEXT_TRANSFORMS into a single step."""
+    key = tuple(pipeline)
+    if key in _compiled:
+        return _compiled[key]
+    steps, run = [], []
+    for tool_name in pipeline + [None]:
+        if tool_name in TEXT_TRANSFORMS:
+            run.append(tool_name)
+            continue
+        if run:
+            steps.append(_fused_tool(run) if len(run) > 1 else TOOLS[run[0]])
+            run = []
+        if tool_name is None:
+            break
         tool = TOOLS.get(tool_name)
         if tool:
-            article = tool(article, config)
+            steps.append(tool)
         else:
             log.warning(f"Unknown processing tool: {tool_name}")
+    _compiled[key] = steps
+    return steps
+
+def process_article(article: dict, config: SiteConfig, pipeline: list[str] = None) -> dict:
+    """Run an article through the processing pipeline."""
+    if pipeline is None:
+        pipeline = config.pipeline
+    for tool in compile_pipeline(pipeline):
+        article = tool(article, config)
     return article
@@ -1,8 +1,8 @@
 """AI summarization using Gemini with retry + failure tracking."""
 
-import os, json, re, time, logging
-from google import genai
-from newsfeed.cost import track_usage
+import json, re, logging
+from newsfeed import llm
+from newsfeed.cost import track_cache
 from newsfeed.config import DEFAULT_MODEL, MODELS_WITH_JSON_MODE
 
 log = logging.getLogger("newsfeed.processing")
@@ -22,6 +22,9 @@ SUMMARY_SCHEMA = {
     "required": ["subtitle", "bullets"]
 }
 
+# Bump whenever SUMMARY_PROMPT changes so cached summaries from the old prompt are not reused
+SUMMARY_PROMPT_VERSION = 1
+
 SUMMARY_PROMPT = """You are a market intelligence analyst for a data center company.
 Summarize this article for a sales team.
 
@@ -67,19 +70,6 @@ def log_failure(url: str, step: str, error: str, retries: int, db=None):
         if own_session:
             db.close()
 
-# ── Gemini Client ───────────────────────────────────────────
-
-_client = None
-
-def _get_client():
-    global _client
-    if _client is None:
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not set in environment")
-        _client = genai.Client(api_key=api_key)
-    return _client
-
 # ── JSON Extraction ─────────────────────────────────────────
 
 def extract_json(text: str) -> dict:
@@ -97,29 +87,37 @@ def extract_json(text: str) -> dict:
         except json.JSONDecodeError: pass
     raise ValueError(f"Could not extract JSON from response: {text[:200]}")
 
+# ── Summary Cache ───────────────────────────────────────────
+
+def cached_summary(text: str, model: str = None) -> dict:
+    """Look up a stored summary for identical content (same model + prompt version)."""
+    from newsfeed.storage.repository import _content_hash, find_cached_summary
+    if model is None: model = DEFAULT_MODEL
+    if not text: return None
+    try:
+        result = find_cached_summary(_content_hash(text), model, SUMMARY_PROMPT_VERSION)
+    except Exception as e:
+        log.warning(f"Summary cache lookup failed: {e}")
+        result = None
+    track_cache(result is not None)
+    return result
+
 # ── Summarize with Retry ───────────────────────────────────
 
-def summarize(text: str, url: str = "", model: str = None,
-              max_retries: int = 3, retry_delay: float = 2.0) -> dict:
-    """Generate subtitle + bullet summary with retry logic."""
+def summarize(text: str, url: str = "", model: str = None, max_retries: int = 3) -> dict:
+    """Generate subtitle + bullet summary.
+
+    Transient API errors are retried (and rate limited) by newsfeed.llm; a malformed
+    response is re-requested up to `max_retries` times.
+    """
     if model is None: model = DEFAULT_MODEL
-    client = _get_client()
     use_json_mode = model in MODELS_WITH_JSON_MODE
+    config = {"response_mime_type": "application/json"} if use_json_mode else {}
 
     for attempt in range(1, max_retries + 1):
         try:
-            config = {"response_mime_type": "application/json"} if use_json_mode else {}
-            response = client.models.generate_content(
-                model=model,
-                contents=SUMMARY_PROMPT + text,
-                config=config,
-            )
-            # Track cost
-            usage = response.usage_metadata
-            input_tok = getattr(usage, 'prompt_token_count', None) or 0
-            output_tok = getattr(usage, 'candidates_token_count', None) or 0
-            track_usage(input_tok, output_tok, model)
-            log.info(f"Summarized ({input_tok} in, {output_tok} out tokens)")
+            response = llm.generate(SUMMARY_PROMPT + text, model=model, config=config)
+            log.info(f"Summarized ({response.input_tokens} in, {response.output_tokens} out tokens)")
 
             result = extract_json(response.text) if not use_json_mode else json.loads(response.text)
 
@@ -131,11 +129,13 @@ def summarize(text: str, url: str = "", model: str = None,
 
             return result
 
-        except Exception as e:
-            log.warning(f"Attempt {attempt}/{max_retries} failed: {e}")
-            if attempt < max_retries:
-                time.sleep(retry_delay * (2 ** attempt))  # exponential backoff
-            else:
+        except llm.LLMError as e:
+            log.error(f"Summarization failed for {url}: {e}")
+            log_failure(url, "summarize", str(e), attempt)
+            return None
+        except Exception as e:  # malformed or invalid response
+            log.warning(f"Attempt {attempt}/{max_retries} returned an unusable response: {e}")
+            if attempt == max_retries:
                 log.error(f"All {max_retries} attempts failed for: {url}")
                 log_failure(url, "summarize", str(e), max_retries)
                 return None
@@ -1,24 +1,112 @@
-import json, logging
+import json, logging, re, threading
+from collections import Counter
 from pathlib import Path
+from typing import Optional
 
 log = logging.getLogger("newsfeed.processing")
 
 TAGS_PATH = Path(__file__).parent.parent / "sites" / "tags.json"
 
-_tags_config = None
-
-def _load_tags() -> dict:
-    global _tags_config
-    if _tags_config is None:
-        with open(TAGS_PATH) as f:
-            _tags_config = json.load(f)
-    return _tags_config
-
-def auto_tag(text: str) -> list[str]:
-    """Match article text against keyword tag definitions."""
-    tags_config = _load_tags()
-    text_lower = text.lower()
-    matched = [tag for tag, keywords in tags_config.items()
-               if any(kw.lower() in text_lower for kw in keywords)]
+# ── Keyword Automaton ───────────────────────────────────────
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over the tag taxonomy.
+
+    Finds every keyword in one pass over the text. Matches must start and end
+    on a word boundary, where a trailing plural "s"/"es" still counts as the
+    end ("carrier" matches "carriers", "campus" matches "campuses"); a keyword
+    ending in `*` only needs the start boundary, so "develop*" matches
+    "developer" and "development".
+    """
+
+    def __init__(self, taxonomy: dict[str, list[str]]):
+        self.tags = list(taxonomy)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[tuple[str, int, bool]]] = [[]]
+        for tag, keywords in taxonomy.items():
+            for kw in keywords:
+                kw = " ".join(kw.lower().split())
+                prefix = kw.endswith("*")
+                kw = kw.rstrip("*")
+                if kw: self._add(kw, (tag, len(kw), prefix))
+        self._link()
+
+    def _add(self, keyword: str, output: tuple[str, int, bool]):
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = self._goto[state][ch] = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(output)
+
+    def _link(self):
+        """Breadth-first failure links; each state inherits its fallback's outputs."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def hits(self, text: str) -> Counter:
+        """Count keyword matches per tag in `text`."""
+        text = re.sub(r"\s+", " ", text.lower())
+        goto, fail, out = self._goto, self._fail, self._out
+        counts, state, n = Counter(), 0, len(text)
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for tag, length, prefix in out[state]:
+                start = i - length + 1
+                if start > 0 and text[start - 1].isalnum(): continue
+                if not prefix and not _ends_word(text, i + 1, n): continue
+                counts[tag] += 1
+        return counts
+
+def _ends_word(text: str, end: int, n: int) -> bool:
+    """Does a match ending before `end` end a word, allowing a plural "s"/"es" suffix?"""
+    for suffix in ("", "s", "es"):
+        after = end + len(suffix)
+        if text.startswith(suffix, end) and (after >= n or not text[after].isalnum()):
+            return True
+    return False
+
+# ── Taxonomy Loading ────────────────────────────────────────
+
+_automaton: Optional[KeywordAutomaton] = None
+_loaded_mtime: Optional[int] = None
+_load_lock = threading.Lock()
+
+def _load_automaton() -> KeywordAutomaton:
+    """Compiled taxonomy, rebuilt whenever tags.json changes on disk."""
+    global _automaton, _loaded_mtime
+    mtime = TAGS_PATH.stat().st_mtime_ns
+    if mtime != _loaded_mtime:
+        with _load_lock:
+            if mtime != _loaded_mtime:
+                with open(TAGS_PATH) as f:
+                    _automaton = KeywordAutomaton(json.load(f))
+                _loaded_mtime = mtime
+                log.info(f"Loaded tag taxonomy: {len(_automaton.tags)} tags")
+    return _automaton
+
+def tag_hits(text: str) -> dict[str, int]:
+    """Per-tag keyword hit counts for `text`."""
+    return dict(_load_automaton().hits(text))
+
+def auto_tag(text: str, min_hits: int = 1) -> list[str]:
+    """Match article text against keyword tag definitions (tags with at least `min_hits` hits)."""
+    automaton = _load_automaton()
+    hits = automaton.hits(text)
+    matched = [tag for tag in automaton.tags if hits[tag] >= min_hits]
     log.info(f"Tagged: {matched}")
     return matched
@@ -0,0 +1,57 @@
+"""Token-bucket rate limiting shared by the fetch and LLM layers."""
+import asyncio, threading, time
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`.
+
+    Callers reserve tokens up front and sleep off any deficit, so the bucket
+    is safe to share across threads and event loops.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float) -> float:
+        """Take `tokens` now and return how long the caller must wait for them."""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def adjust(self, tokens: float):
+        """Charge (or refund, if negative) tokens without waiting, e.g. once actual usage is known."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - tokens)
+
+    def slow_to(self, rate: float):
+        """Lower the refill rate to `rate` (never raises it), keeping whatever is already owed."""
+        with self._lock:
+            self._refill()
+            self.rate = min(self.rate, rate)
+
+    def pause(self, seconds: float):
+        """Hold the bucket empty so the next token is available only after `seconds`."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+    def acquire_sync(self, tokens: float = 1.0):
+        """Block the current thread until `tokens` are available."""
+        wait = self.reserve(tokens)
+        if wait: time.sleep(wait)
+
+    async def acquire(self, tokens: float = 1.0):
+        """Sleep the current task until `tokens` are available."""
+        wait = self.reserve(tokens)
+        if wait: await asyncio.sleep(wait)
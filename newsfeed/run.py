@@ -3,9 +3,11 @@
 import argparse, logging
 import newsfeed.env  # noqa: F401 — load .env once
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
+from newsfeed.logcontext import LOG_FORMAT
 
-from newsfeed.pipeline import run
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+from newsfeed.pipeline import run, run_sites
 
 def main():
     parser = argparse.ArgumentParser(description="Market Intelligence News Feed")
@@ -14,14 +16,18 @@ def main():
     parser.add_argument("--to", dest="to_date", default=None, help="To date (YYYY-MM-DD)")
     parser.add_argument("--max-pages", type=int, default=5, help="Max listing pages to fetch")
     parser.add_argument("--no-verify-ssl", action="store_true", help="Disable SSL verification")
+    parser.add_argument("--historical", action="store_true",
+                        help="Binary-search listing pages for the date range (searches up to --max-pages)")
+    parser.add_argument("--parallel-sites", type=int, default=1, help="Sites to run at once (all-sites mode)")
     args = parser.parse_args()
 
     if args.site:
-        run(args.site, args.from_date, args.to_date, args.max_pages, args.no_verify_ssl)
+        run(args.site, args.from_date, args.to_date, args.max_pages, args.no_verify_ssl, historical=args.historical)
     else:
         from newsfeed.config import load_all_site_configs
-        for site_name in load_all_site_configs():
-            run(site_name, args.from_date, args.to_date, args.max_pages, args.no_verify_ssl)
+        run_sites(load_all_site_configs(), args.parallel_sites, from_date=args.from_date,
+                  to_date=args.to_date, max_pages=args.max_pages, no_verify_ssl=args.no_verify_ssl,
+                  historical=args.historical)
 
 if __name__ == "__main__":
     from newsfeed.web.queries.feed import set_job_complete
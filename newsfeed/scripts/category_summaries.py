@@ -1,29 +1,25 @@
 """Generate category summaries — daily, weekly, monthly."""
 
-import os, json, logging, time
+import json, hashlib, logging, contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timedelta
+from typing import Optional
 import newsfeed.env  # noqa: F401 — load .env once
 
 from sqlalchemy import func
-from google import genai
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import load_only
+from newsfeed import llm
 from newsfeed.storage.database import get_session
 from newsfeed.storage.models import (
-    Article, ArticleTag, Tag, CategorySummary, AppSetting
+    Article, ArticleTag, Tag, CategorySummary, CategorySummaryPart, AppSetting
 )
-from newsfeed.cost import track_usage
 from newsfeed.config import DEFAULT_MODEL, MODEL_TOKEN_LIMITS
 
 log = logging.getLogger("newsfeed.scripts.category_summaries")
 
-# ── Gemini Client ───────────────────────────────────────────
-
-_client = None
-
-def _get_client():
-    global _client
-    if _client is None:
-        _client = genai.Client(api_key=os.environ["GOOGLE_API_KEY"])
-    return _client
+# LLM calls in flight across all categories; newsfeed.llm paces them to the model's quota
+LLM_CONCURRENCY = 4
 
 # ── Helpers ─────────────────────────────────────────────────
 
@@ -41,11 +37,12 @@ def get_articles_for_tag(db, tag_name: str, date_from: date, date_to: date) -> l
         db.query(Article)
         .join(ArticleTag, Article.id == ArticleTag.article_id)
         .join(Tag, ArticleTag.tag_id == Tag.id)
+        .options(load_only(Article.id, Article.title, Article.date, Article.content))
         .filter(Tag.name == tag_name)
         .filter(Article.date >= date_from)
         .filter(Article.date <= date_to)
         .filter(ArticleTag.removed == False)
-        .order_by(Article.date.desc())
+        .order_by(Article.date.desc(), Article.id.desc())  # stable chunks, so resumed runs match
         .all()
     )
 
@@ -110,25 +107,25 @@ def get_token_limit(model: str) -> int:
     """Get token limit for a model from config."""
     return MODEL_TOKEN_LIMITS.get(model, 8192)
 
+def article_line(a: Article) -> str:
+    return f"- {a.title} ({a.date}): {truncate_to_sentence(a.content)}"
+
+def content_budget(model: str, template: str, **fields) -> int:
+    """Tokens left for articles/summaries: 70% of the model limit (30% for template + response) minus the template."""
+    return int(get_token_limit(model) * 0.7) - estimate_tokens(template.format(**fields))
+
 def chunk_articles(articles: list[Article], tag_name: str,
                    date_from, date_to, model: str) -> list[list[Article]]:
     """Split articles into chunks that fit within the model's token budget."""
-    token_limit = get_token_limit(model)
-    # Use 70% of limit for content, leaving 30% for prompt template + response
-    content_budget = int(token_limit * 0.7)
-    # Subtract prompt template overhead (without articles)
-    template_overhead = estimate_tokens(CATEGORY_PROMPT.format(
-        count=0, tag=tag_name, date_from=date_from, date_to=date_to, articles=""
-    ))
-    available = content_budget - template_overhead
+    available = content_budget(model, CATEGORY_PROMPT, count=0, tag=tag_name,
+                               date_from=date_from, date_to=date_to, articles="")
 
     chunks = []
     current_chunk = []
     current_tokens = 0
 
     for a in articles:
-        article_text = f"- {a.title} ({a.date}): {truncate_to_sentence(a.content)}"
-        article_tokens = estimate_tokens(article_text)
+        article_tokens = estimate_tokens(article_line(a))
 
         if current_tokens + article_tokens > available and current_chunk:
             chunks.append(current_chunk)
@@ -144,84 +141,123 @@ def chunk_articles(articles: list[Article], tag_name: str,
     return chunks
 
 # ── Map-Reduce Summarization ───────────────────────────────
+# Map: one call per chunk of articles. Reduce: partial summaries are grouped to
+# fit the token budget and each group combined, level by level, until one
+# summary is left. Every call of a level goes to the shared pool at once, and
+# each finished step is persisted (CategorySummaryPart) so a rerun resumes.
 
-def summarize_chunk(tag_name: str, articles: list[Article],
-                    date_from, date_to, model: str) -> tuple[str, int, int]:
-    """Summarize a single chunk of articles. Returns (summary, prompt_tokens, response_tokens)."""
-    article_text = "\n\n".join(
-        f"- {a.title} ({a.date}): {truncate_to_sentence(a.content)}"
-        for a in articles
-    )
-    prompt = CATEGORY_PROMPT.format(
+def node_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\n{prompt}".encode()).hexdigest()[:40]
+
+def map_prompt(tag_name: str, articles: list[Article], date_from, date_to) -> str:
+    return CATEGORY_PROMPT.format(
         count=len(articles), tag=tag_name,
         date_from=date_from, date_to=date_to,
-        articles=article_text,
+        articles="\n\n".join(article_line(a) for a in articles),
+    )
+
+def reduce_prompt(tag_name: str, count: int, summaries: list[str], date_from, date_to) -> str:
+    return REDUCE_PROMPT.format(
+        count=count, tag=tag_name,
+        date_from=date_from, date_to=date_to,
+        summaries="\n\n".join(f"Summary {i+1}:\n{s}" for i, s in enumerate(summaries)),
     )
-    client = _get_client()
-    response = client.models.generate_content(model=model, contents=prompt)
-    usage = response.usage_metadata
-    return response.text, usage.prompt_token_count or 0, usage.candidates_token_count or 0
+
+def group_partials(summaries: list[str], available: int) -> list[list[str]]:
+    """Split partial summaries into groups that fit `available` tokens (at least two per group, so each level shrinks)."""
+    groups, current, tokens = [], [], 0
+    for s in summaries:
+        s_tokens = estimate_tokens(s) + 5  # "Summary N:" header
+        if current and len(current) >= 2 and tokens + s_tokens > available:
+            groups.append(current)
+            current, tokens = [], 0
+        current.append(s)
+        tokens += s_tokens
+    if len(current) == 1 and groups:
+        groups[-1].append(current[0])  # never leave a lone partial to be "reduced" alone
+    elif current:
+        groups.append(current)
+    return groups
+
+class PartStore:
+    """Finished steps for one category and period, loaded up front and saved as they complete."""
+
+    def __init__(self, db, tag_id: Optional[int], date_from: date, date_to: date):
+        self.db, self.tag_id, self.date_from, self.date_to = db, tag_id, date_from, date_to
+        self.parts = {} if tag_id is None else dict(
+            db.query(CategorySummaryPart.node_key, CategorySummaryPart.summary)
+            .filter_by(tag_id=tag_id, date_from=date_from, date_to=date_to))
+
+    def put(self, key: str, level: int, summary: str):
+        self.parts[key] = summary
+        if self.tag_id is None: return
+        self.db.execute(pg_insert(CategorySummaryPart).values(
+            tag_id=self.tag_id, date_from=self.date_from, date_to=self.date_to,
+            node_key=key, level=level, summary=summary,
+        ).on_conflict_do_nothing())
+        self.db.commit()
+
+    def clear(self):
+        """Delete this period's parts (committed with the final summary by the caller)."""
+        if self.tag_id is None: return
+        (self.db.query(CategorySummaryPart)
+         .filter_by(tag_id=self.tag_id, date_from=self.date_from, date_to=self.date_to)
+         .delete(synchronize_session=False))
+
+def run_level(pool, prompts: list[str], store: PartStore, level: int, model: str, label: str) -> list[str]:
+    """Run every prompt of one level concurrently (reusing stored results); returns summaries in order."""
+    keys = [node_key(model, p) for p in prompts]
+    futures = {pool.submit(contextvars.copy_context().run, llm.generate, p, model=model): k
+               for p, k in zip(prompts, keys) if k not in store.parts}
+    if len(futures) < len(prompts):
+        log.info(f"{label}: level {level} resuming with {len(prompts) - len(futures)}/{len(prompts)} done")
+    errors = []
+    for future in as_completed(futures):
+        try:
+            response = future.result()
+        except Exception as e:
+            errors.append(e)
+            continue
+        store.put(futures[future], level, response.text)  # saved even if a sibling fails
+        log.info(f"{label}: level {level} step done ({response.input_tokens} in, {response.output_tokens} out)")
+    if errors:
+        raise errors[0]
+    return [store.parts[k] for k in keys]
 
 def generate_summary(tag_name: str, articles: list[Article],
                      date_from: date, date_to: date,
-                     model: str = None) -> str:
+                     model: str = None, pool: ThreadPoolExecutor = None,
+                     store: PartStore = None) -> str:
     if model is None: model = DEFAULT_MODEL
+    store = store or PartStore(None, None, date_from, date_to)
+    owns_pool = pool is None
+    pool = pool or ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="category-llm")
 
     try:
         chunks = chunk_articles(articles, tag_name, date_from, date_to, model)
-
-        if len(chunks) == 1:
-            # Fits in a single call
-            summary, p_tokens, r_tokens = summarize_chunk(
-                tag_name, chunks[0], date_from, date_to, model
-            )
-            track_usage(p_tokens, r_tokens, model)
-            log.info(f"Category summary for '{tag_name}' ({p_tokens} in, {r_tokens} out)")
-            return summary
-
-        # Map step: summarize each chunk
-        log.info(f"Map-reduce: '{tag_name}' split into {len(chunks)} chunks")
-        partial_summaries = []
-        total_p, total_r = 0, 0
-
-        for i, chunk in enumerate(chunks):
-            if i > 0:
-                log.info(f"  Rate limit pause (45s)...")
-                time.sleep(45)
-            summary, p_tokens, r_tokens = summarize_chunk(
-                tag_name, chunk, date_from, date_to, model
-            )
-            partial_summaries.append(summary)
-            total_p += p_tokens
-            total_r += r_tokens
-            log.info(f"  Chunk {i+1}/{len(chunks)}: {len(chunk)} articles ({p_tokens} in, {r_tokens} out)")
-
-        # Reduce step: combine partial summaries (pause for rate limit)
-        log.info(f"  Rate limit pause before reduce (45s)...")
-        time.sleep(45)
-        combined = "\n\n".join(
-            f"Summary {i+1}:\n{s}" for i, s in enumerate(partial_summaries)
-        )
-        reduce_prompt = REDUCE_PROMPT.format(
-            count=len(articles), tag=tag_name,
-            date_from=date_from, date_to=date_to,
-            summaries=combined,
-        )
-
-        client = _get_client()
-        response = client.models.generate_content(model=model, contents=reduce_prompt)
-        usage = response.usage_metadata
-        total_p += usage.prompt_token_count or 0
-        total_r += usage.candidates_token_count or 0
-
-        track_usage(total_p, total_r, model)
-        log.info(f"Category summary for '{tag_name}' — map-reduce total ({total_p} in, {total_r} out)")
-
-        return response.text
+        if len(chunks) > 1:
+            log.info(f"Map-reduce: '{tag_name}' split into {len(chunks)} chunks")
+        summaries = run_level(pool, [map_prompt(tag_name, c, date_from, date_to) for c in chunks],
+                              store, 0, model, tag_name)
+
+        available = content_budget(model, REDUCE_PROMPT, count=len(articles), tag=tag_name,
+                                   date_from=date_from, date_to=date_to, summaries="")
+        level = 0
+        while len(summaries) > 1:
+            level += 1
+            groups = group_partials(summaries, available)
+            log.info(f"Reduce: '{tag_name}' level {level}: {len(summaries)} partials → {len(groups)}")
+            summaries = run_level(pool, [reduce_prompt(tag_name, len(articles), g, date_from, date_to)
+                                         for g in groups], store, level, model, tag_name)
+
+        log.info(f"Category summary for '{tag_name}' ({len(chunks)} chunks, {level} reduce levels)")
+        return summaries[0]
 
     except Exception as e:
         log.error(f"Failed to generate summary for '{tag_name}': {e}")
         raise
+    finally:
+        if owns_pool: pool.shutdown()
 
 # ── Save ────────────────────────────────────────────────────
 
@@ -244,48 +280,82 @@ def save_summary(db, tag_name: str, date_from: date, date_to: date, summary: str
 
 # ── Period Runners ──────────────────────────────────────────
 
-def run_period(db, categories: list[str], date_from: date, date_to: date, period: str, min_articles: int):
-    log.info(f"--- Running {period} summaries: {date_from} → {date_to} ---")
-    for tag_name in categories:
+def summarize_category(tag_name: str, date_from: date, date_to: date, min_articles: int,
+                       pool: ThreadPoolExecutor):
+    """Summarize one category for one period in its own session; its LLM calls go to `pool`."""
+    db = get_session()
+    try:
         if summary_exists(db, tag_name, date_from, date_to):
             log.info(f"Skipping '{tag_name}' — already exists")
-            continue
+            return
         articles = get_articles_for_tag(db, tag_name, date_from, date_to)
         if len(articles) < min_articles:
             log.info(f"Skipping '{tag_name}' — only {len(articles)} articles (min {min_articles})")
-            continue
-        summary = generate_summary(tag_name, articles, date_from, date_to)
+            return
+        tag_id = db.query(Tag.id).filter(Tag.name == tag_name).scalar()
+        store = PartStore(db, tag_id, date_from, date_to)
+        summary = generate_summary(tag_name, articles, date_from, date_to, pool=pool, store=store)
+        store.clear()
         save_summary(db, tag_name, date_from, date_to, summary)
+    finally:
+        db.close()
+
+def run_period(db, categories: list[str], date_from: date, date_to: date, period: str, min_articles: int,
+               pool: ThreadPoolExecutor = None):
+    """Summarize all categories at once, sharing one bounded pool of LLM calls."""
+    log.info(f"--- Running {period} summaries: {date_from} → {date_to} ---")
+    owns_pool = pool is None
+    pool = pool or ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="category-llm")
+    errors = []
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, len(categories)), thread_name_prefix="category") as runners:
+            futures = {runners.submit(contextvars.copy_context().run, summarize_category,
+                                      tag_name, date_from, date_to, min_articles, pool): tag_name
+                       for tag_name in categories}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    errors.append(f"{futures[future]}: {e}")
+    finally:
+        if owns_pool: pool.shutdown()
+    if errors:
+        raise RuntimeError(f"{len(errors)} {period} summaries failed (progress kept, rerun to resume): "
+                           + "; ".join(errors))
 
 # ── Main: Check Date & Run ─────────────────────────────────
 
 def run(target_date: date = None):
     target = target_date or date.today()
     db = get_session()
+    pool = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY, thread_name_prefix="category-llm")
 
     categories = get_summary_categories(db)
     if not categories:
         log.warning("No summary_categories configured in app_settings")
+        db.close()
         return
     min_articles = get_min_articles(db)
 
     log.info(f"Categories: {categories}, min articles: {min_articles}")
 
-    # Always run daily
-    run_period(db, categories, target, target, "daily", min_articles)
-
-    # Weekly: run on Sundays
-    if target.weekday() == 6:  # Sunday
-        week_start = target - timedelta(days=6)
-        run_period(db, categories, week_start, target, "weekly", min_articles)
-
-    # Monthly: run on 1st of month (for previous month)
-    if target.day == 1:
-        month_end = target - timedelta(days=1)
-        month_start = month_end.replace(day=1)
-        run_period(db, categories, month_start, month_end, "monthly", min_articles)
+    try:
+        # Always run daily
+        run_period(db, categories, target, target, "daily", min_articles, pool)
 
-    db.close()
+        # Weekly: run on Sundays
+        if target.weekday() == 6:  # Sunday
+            week_start = target - timedelta(days=6)
+            run_period(db, categories, week_start, target, "weekly", min_articles, pool)
+
+        # Monthly: run on 1st of month (for previous month)
+        if target.day == 1:
+            month_end = target - timedelta(days=1)
+            month_start = month_end.replace(day=1)
+            run_period(db, categories, month_start, month_end, "monthly", min_articles, pool)
+    finally:
+        pool.shutdown()
+        db.close()
     log.info("Done.")
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ from newsfeed.storage.models import (
     Article, ArticleStar, ArticleSummary, Digest, DigestItem, DigestSummary
 )
 from sqlalchemy import func
+from sqlalchemy.orm import load_only
 
 log = logging.getLogger("newsfeed.scripts.create_digest")
 
@@ -19,6 +20,7 @@ def get_starred_articles(db, date_from: date, date_to: date) -> list[Article]:
     return (
         db.query(Article)
         .join(ArticleStar, Article.id == ArticleStar.article_id)
+        .options(load_only(Article.id, Article.title, Article.date))
         .filter(Article.date >= date_from)
         .filter(Article.date <= date_to)
         .order_by(Article.date.desc())
@@ -80,6 +82,7 @@ def collect_digest_articles(db, digest_id: int) -> list[Article]:
     return (
         db.query(Article)
         .join(DigestItem, Article.id == DigestItem.article_id)
+        .options(load_only(Article.id, Article.title, Article.date))
         .filter(DigestItem.digest_id == digest_id)
         .order_by(DigestItem.sort_order)
         .all()
@@ -11,7 +11,7 @@ from newsfeed.storage.models import (
     Digest, DigestItem, DigestSummary
 )
 from sqlalchemy import func, desc
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only
 
 log = logging.getLogger("newsfeed.scripts.create_newsletter")
 
@@ -23,6 +23,7 @@ def get_starred_articles(db, date_from: date, date_to: date) -> list[Article]:
         db.query(Article)
         .join(ArticleStar, Article.id == ArticleStar.article_id)
         .options(
+            load_only(Article.id, Article.title, Article.date, Article.url, Article.summary),
             joinedload(Article.tags).joinedload(ArticleTag.tag),
             joinedload(Article.summaries),
             joinedload(Article.source),
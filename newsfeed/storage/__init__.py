@@ -1,5 +1,5 @@
 from .database import Base, get_engine, get_session, init_db
-from .repository import save_article
+from .repository import save_article, save_articles
 
 from .models import (
     User, Role, UserRole, Source, Tag,
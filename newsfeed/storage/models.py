@@ -4,10 +4,10 @@ from datetime import datetime, date
 from typing import Optional
 from sqlalchemy import (
     String, Text, Integer, Boolean, Date, DateTime, ForeignKey,
-    Index, CheckConstraint, UniqueConstraint, func, JSON, Numeric
+    Index, CheckConstraint, UniqueConstraint, func, JSON, Numeric, DDL, event, text
 )
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship, query_expression
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
 from .database import Base
 
 # ── Users & Roles ───────────────────────────────────────────
@@ -76,10 +76,11 @@ class Article(Base):
     title: Mapped[str] = mapped_column(Text, nullable=False)
     date: Mapped[Optional[date]] = mapped_column(Date)
     date_raw: Mapped[Optional[str]] = mapped_column(Text)
-    summary: Mapped[Optional[str]] = mapped_column(Text)
+    # Bulky text is deferred (group "text"); list queries never pay for it
+    summary: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="text")
     image_url: Mapped[Optional[str]] = mapped_column(Text)
-    content_raw: Mapped[Optional[str]] = mapped_column(Text)
-    content: Mapped[Optional[str]] = mapped_column(Text)
+    content_raw: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="text")
+    content: Mapped[Optional[str]] = mapped_column(Text, deferred=True, deferred_group="text")
     content_hash: Mapped[Optional[str]] = mapped_column(Text)
     jina_title: Mapped[Optional[str]] = mapped_column(Text)
     jina_url: Mapped[Optional[str]] = mapped_column(Text)
@@ -87,6 +88,19 @@ class Article(Base):
     fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
     updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), onupdate=func.now())
+    search_vector = mapped_column(TSVECTOR, deferred=True)  # maintained by triggers, see below
+    # Enrichment state: backfill only visits rows still needing a summary or tags,
+    # and retries failed summaries with a capped, exponentially growing cool-down
+    needs_summary: Mapped[bool] = mapped_column(Boolean, default=True, server_default=text("true"))
+    needs_tags: Mapped[bool] = mapped_column(Boolean, default=True, server_default=text("true"))
+    enrich_attempts: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"))
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    # Populated per-query by search_articles (ts_headline snippet, relevance for the cursor)
+    search_headline: Mapped[Optional[str]] = query_expression()
+    search_rank: Mapped[Optional[float]] = query_expression()
+    # Populated per-query by the feed queries: has the current user starred this?
+    starred: Mapped[Optional[bool]] = query_expression()
 
     source: Mapped["Source"] = relationship(back_populates="articles")
     summaries: Mapped[list["ArticleSummary"]] = relationship(back_populates="article")
@@ -95,8 +109,16 @@ class Article(Base):
 
     __table_args__ = (
         Index("idx_articles_date", "date", postgresql_using="btree"),
+        # Feed sort key (undated last) + id tiebreaker — serves keyset pagination
+        Index("idx_articles_feed_order", text("coalesce(date, DATE '0001-01-01')"), "id"),
         Index("idx_articles_source", "source_id"),
         Index("idx_articles_content_hash", "content_hash"),
+        Index("idx_articles_search_vector", "search_vector", postgresql_using="gin"),
+        Index("idx_articles_title_trgm", "title", postgresql_using="gin",
+              postgresql_ops={"title": "gin_trgm_ops"}),
+        # Partial indexes: only pending rows are indexed, so they stay tiny
+        Index("idx_articles_needs_summary", "next_attempt_at", postgresql_where=text("needs_summary")),
+        Index("idx_articles_needs_tags", "id", postgresql_where=text("needs_tags")),
         CheckConstraint("status IN ('draft', 'approved', 'rejected')", name="ck_articles_status"),
     )
 
@@ -111,6 +133,8 @@ class ArticleSummary(Base):
     subtitle: Mapped[Optional[str]] = mapped_column(Text)
     bullets: Mapped[Optional[dict]] = mapped_column(JSONB)
     is_auto: Mapped[bool] = mapped_column(Boolean, default=True)
+    model: Mapped[Optional[str]] = mapped_column(Text)  # LLM that produced an auto summary
+    prompt_version: Mapped[Optional[int]] = mapped_column(Integer)
     created_by: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
@@ -273,6 +297,26 @@ class CategorySummary(Base):
         CheckConstraint("date_from <= date_to", name="ck_category_summaries_dates"),
     )
 
+# Finished map/reduce steps of a category summary still in progress, so an
+# interrupted run resumes. node_key hashes the step's prompt (changed inputs never
+# reuse a stale part); rows are deleted when the final CategorySummary is saved.
+
+class CategorySummaryPart(Base):
+    __tablename__ = "category_summary_parts"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id", ondelete="CASCADE"), nullable=False)
+    date_from: Mapped[date] = mapped_column(Date, nullable=False)
+    date_to: Mapped[date] = mapped_column(Date, nullable=False)
+    node_key: Mapped[str] = mapped_column(Text, nullable=False)
+    level: Mapped[int] = mapped_column(Integer, nullable=False)  # 0 = map, 1+ = reduce
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("tag_id", "date_from", "date_to", "node_key", name="uq_category_summary_parts"),
+    )
+
 # ── Failures ────────────────────────────────────────────────
 
 class Failure(Base):
@@ -313,6 +357,35 @@ class PipelineRun(Base):
         Index("idx_pipeline_runs_date", "run_at"),
     )
 
+# ── Jobs ────────────────────────────────────────────────────
+# Queue for long-running work (pipeline, summaries, backfill...). Endpoints
+# enqueue; `python -m newsfeed.worker` claims with FOR UPDATE SKIP LOCKED.
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    kind: Mapped[str] = mapped_column(Text, nullable=False)
+    params: Mapped[dict] = mapped_column(JSONB, default=dict, server_default=text("'{}'::jsonb"))
+    status: Mapped[str] = mapped_column(Text, default="queued", server_default=text("'queued'"))
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default=text("0"))
+    max_attempts: Mapped[int] = mapped_column(Integer, default=1, server_default=text("1"))
+    run_after: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    locked_by: Mapped[Optional[str]] = mapped_column(Text)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    result: Mapped[Optional[dict]] = mapped_column(JSONB)
+    error: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        CheckConstraint("status IN ('queued', 'running', 'done', 'failed')", name="ck_jobs_status"),
+        # Claim order; only queued rows are indexed
+        Index("idx_jobs_queued", "run_after", "id", postgresql_where=text("status = 'queued'")),
+        Index("idx_jobs_running", "heartbeat_at", postgresql_where=text("status = 'running'")),
+    )
+
 # ── App Settings ────────────────────────────────────────────
 
 class AppSetting(Base):
@@ -360,3 +433,58 @@ class DigestSummary(Base):
         UniqueConstraint("digest_id", "version", name="uq_digest_summaries_version"),
         Index("idx_digest_summaries_digest", "digest_id"),
     )
+
+# ── Full-Text Search ────────────────────────────────────────
+# articles.search_vector = title (A) + latest summary subtitle/bullets (B) + content (D).
+# Kept current by triggers on both articles and article_summaries.
+
+event.listen(Base.metadata, "before_create",
+             DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"))
+
+SEARCH_DDL = [
+    """
+    CREATE OR REPLACE FUNCTION article_summary_text(a_id integer) RETURNS text AS $$
+        SELECT concat_ws(' • ', s.subtitle, (
+            SELECT string_agg(b, ' • ') FROM jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(s.bullets) = 'array' THEN s.bullets ELSE '[]'::jsonb END) AS b))
+        FROM article_summaries s WHERE s.article_id = a_id
+        ORDER BY s.version DESC, s.id DESC LIMIT 1
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION article_search_document(a_id integer, a_title text, a_content text)
+    RETURNS tsvector AS $$
+        SELECT setweight(to_tsvector('english', coalesce(a_title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(article_summary_text(a_id), '')), 'B')
+            || setweight(to_tsvector('english', left(coalesce(a_content, ''), 100000)), 'D')
+    $$ LANGUAGE sql STABLE
+    """,
+    """
+    CREATE OR REPLACE FUNCTION articles_search_vector_trigger() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := article_search_document(NEW.id, NEW.title, NEW.content);
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION article_summaries_search_vector_trigger() RETURNS trigger AS $$
+    BEGIN
+        UPDATE articles SET search_vector = article_search_document(id, title, content)
+        WHERE id = CASE WHEN TG_OP = 'DELETE' THEN OLD.article_id ELSE NEW.article_id END;
+        RETURN NULL;
+    END $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS trg_articles_search_vector ON articles",
+    """
+    CREATE TRIGGER trg_articles_search_vector BEFORE INSERT OR UPDATE OF title, content ON articles
+    FOR EACH ROW EXECUTE FUNCTION articles_search_vector_trigger()
+    """,
+    "DROP TRIGGER IF EXISTS trg_article_summaries_search_vector ON article_summaries",
+    """
+    CREATE TRIGGER trg_article_summaries_search_vector AFTER INSERT OR UPDATE OR DELETE ON article_summaries
+    FOR EACH ROW EXECUTE FUNCTION article_summaries_search_vector_trigger()
+    """,
+]
+
+for statement in SEARCH_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
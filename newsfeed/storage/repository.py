@@ -1,8 +1,9 @@
-"""Repository layer — per-article database operations."""
+"""Repository layer — article database operations."""
 
 import hashlib, logging
 from datetime import datetime, timezone
-from sqlalchemy.exc import IntegrityError
+from typing import Optional
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from .database import get_session
 from .models import Article, ArticleSummary, ArticleTag, Tag, Source, Failure, PipelineRun
 log = logging.getLogger("newsfeed.storage")
@@ -28,74 +29,185 @@ def _get_or_create_tag(session, tag_name: str) -> Tag:
         session.flush()
     return tag
 
-# ── Core: Save One Article ──────────────────────────────────
-
-def save_article(article_dict: dict, source_name: str, source_url: str, db=None) -> bool:
-    """Save a single processed article + summary + tags. Returns True on success."""
+def find_existing_urls(urls, db=None) -> set[str]:
+    """Return the subset of `urls` already stored in the articles table (one IN query)."""
+    urls = list(set(urls))
+    if not urls:
+        return set()
     owns_session = db is None
     session = db or get_session()
     try:
-        source = _get_or_create_source(session, source_name, source_url)
+        rows = session.query(Article.url).filter(Article.url.in_(urls)).all()
+        return {url for (url,) in rows}
+    finally:
+        if owns_session:
+            session.close()
 
-        # Dedup by URL
-        existing = session.query(Article).filter_by(url=article_dict["url"]).first()
-        if existing:
-            log.info(f"Skipping duplicate: {article_dict['url']}")
-            return True
+def find_cached_summary(content_hash: str, model: str, prompt_version: int, db=None) -> Optional[dict]:
+    """Return subtitle/bullets of an auto summary already produced for identical content, if any."""
+    owns_session = db is None
+    session = db or get_session()
+    try:
+        row = (session.query(ArticleSummary.subtitle, ArticleSummary.bullets)
+               .join(Article, Article.id == ArticleSummary.article_id)
+               .filter(Article.content_hash == content_hash,
+                       ArticleSummary.model == model,
+                       ArticleSummary.prompt_version == prompt_version,
+                       ArticleSummary.is_auto == True,
+                       ArticleSummary.subtitle != None,
+                       ArticleSummary.subtitle != '')
+               .order_by(ArticleSummary.created_at.desc())
+               .first())
+        return {"subtitle": row.subtitle, "bullets": row.bullets} if row else None
+    finally:
+        if owns_session:
+            session.close()
 
-        # Insert article
-        article = Article(
-            url=article_dict["url"],
-            source_id=source.id,
-            title=article_dict.get("title", ""),
-            date=datetime.strptime(article_dict["date"], "%Y-%m-%d").date() if article_dict.get("date") else None,
-            date_raw=article_dict.get("date_raw"),
-            summary=article_dict.get("summary"),
-            image_url=article_dict.get("image_url"),
-            content_raw=article_dict.get("content_raw"),
-            content=article_dict.get("content"),
-            content_hash=_content_hash(article_dict["content"]) if article_dict.get("content") else None,
-            jina_title=article_dict.get("jina_title"),
-            jina_url=article_dict.get("jina_url"),
-            status="draft",
-            processed_at=datetime.now(timezone.utc),
-        )
-        session.add(article)
-        session.flush()
+# ── Core: Save Articles ─────────────────────────────────────
+
+def _article_row(article_dict: dict, source_id: int) -> dict:
+    """Column values for one articles row."""
+    return dict(
+        url=article_dict["url"],
+        source_id=source_id,
+        title=article_dict.get("title", ""),
+        date=datetime.strptime(article_dict["date"], "%Y-%m-%d").date() if article_dict.get("date") else None,
+        date_raw=article_dict.get("date_raw"),
+        summary=article_dict.get("summary"),
+        image_url=article_dict.get("image_url"),
+        content_raw=article_dict.get("content_raw"),
+        content=article_dict.get("content"),
+        content_hash=_content_hash(article_dict["content"]) if article_dict.get("content") else None,
+        jina_title=article_dict.get("jina_title"),
+        jina_url=article_dict.get("jina_url"),
+        status="draft",
+        processed_at=datetime.now(timezone.utc),
+        # Summarization failed or never ran → pending; auto_tag ran (even with no match) → done
+        needs_summary=not article_dict.get("subtitle"),
+        needs_tags="tags" not in article_dict,
+    )
+
+def _resolve_tags(session, names: set[str]) -> dict[str, int]:
+    """Map tag names to ids, creating any that are missing, in at most three queries."""
+    if not names:
+        return {}
+    tag_ids = dict(session.query(Tag.name, Tag.id).filter(Tag.name.in_(names)).all())
+    missing = names - tag_ids.keys()
+    if missing:
+        session.execute(pg_insert(Tag).values([{"name": n} for n in missing])
+                        .on_conflict_do_nothing(index_elements=["name"]))
+        tag_ids.update(session.query(Tag.name, Tag.id).filter(Tag.name.in_(missing)).all())
+    return tag_ids
+
+def _bulk_insert(session, stmt, rows: list[dict], url_of, failed: list) -> list:
+    """Insert all rows in one statement; if that fails, retry row by row so only bad rows are lost.
+
+    Each attempt runs in a savepoint, so a failure never rolls back the rest of the batch.
+    Returns any RETURNING rows and appends (url, error) to `failed`.
+    """
+    if not rows:
+        return []
+    try:
+        with session.begin_nested():
+            result = session.execute(stmt.values(rows))
+            return result.all() if result.returns_rows else []
+    except Exception as e:
+        log.warning(f"Bulk insert of {len(rows)} rows failed, retrying row by row: {e}")
+    returned = []
+    for row in rows:
+        try:
+            with session.begin_nested():
+                result = session.execute(stmt.values([row]))
+                if result.returns_rows: returned.extend(result.all())
+        except Exception as e:
+            log.error(f"Failed to save {url_of(row)}: {e}")
+            failed.append((url_of(row), str(e)))
+    return returned
+
+def save_articles(batch: list[dict], source_name: str, source_url: str, db=None) -> dict:
+    """Save a batch of processed articles + summaries + tags in one transaction.
+
+    Articles go in with INSERT ... ON CONFLICT (url) DO NOTHING, so existing URLs count as
+    duplicates. Articles that fail are reported in "failed" as (url, error) without rolling
+    back the rest of the batch. A saved article whose summary or tags failed to insert
+    counts as saved and is reported in "partial"; it stays marked needs_summary /
+    needs_tags so backfill fills it in.
+    """
+    result = {"saved": 0, "duplicates": 0, "failed": [], "partial": []}
+    if not batch:
+        return result
+    owns_session = db is None
+    session = db or get_session()
+    try:
+        source = _get_or_create_source(session, source_name, source_url)
 
-        # Insert summary
-        if article_dict.get("subtitle") or article_dict.get("bullets"):
-            summary = ArticleSummary(
-                article_id=article.id,
-                version=1,
-                subtitle=article_dict.get("subtitle"),
-                bullets=article_dict.get("bullets"),
-                is_auto=True,
-            )
-            session.add(summary)
-
-        # Insert tags
-        for tag_name in article_dict.get("tags", []):
-            tag = _get_or_create_tag(session, tag_name)
-            article_tag = ArticleTag(
-                article_id=article.id,
-                tag_id=tag.id,
-                is_auto=True,
-            )
-            session.add(article_tag)
+        by_url, rows = {}, []
+        for a in batch:
+            try:
+                row = _article_row(a, source.id)
+            except Exception as e:
+                log.error(f"Failed to save {a.get('url')}: {e}")
+                result["failed"].append((a.get("url"), str(e)))
+                continue
+            if row["url"] in by_url:
+                result["duplicates"] += 1
+                continue
+            by_url[row["url"]] = a
+            rows.append(row)
+
+        tag_ids = _resolve_tags(session, {t for a in by_url.values() for t in a.get("tags") or []})
+
+        insert_articles = (pg_insert(Article)
+                           .on_conflict_do_nothing(index_elements=["url"])
+                           .returning(Article.id, Article.url))
+        failed_before = len(result["failed"])
+        article_ids = {url: article_id for article_id, url in
+                       _bulk_insert(session, insert_articles, rows, lambda r: r["url"], result["failed"])}
+        result["saved"] = len(article_ids)
+        result["duplicates"] += len(rows) - len(article_ids) - (len(result["failed"]) - failed_before)
+
+        url_by_id = {article_id: url for url, article_id in article_ids.items()}
+        summaries, article_tags = [], []
+        for url, article_id in article_ids.items():
+            a = by_url[url]
+            if a.get("subtitle") or a.get("bullets"):
+                summaries.append(dict(
+                    article_id=article_id, version=1,
+                    subtitle=a.get("subtitle"), bullets=a.get("bullets"), is_auto=True,
+                    model=a.get("summary_model"), prompt_version=a.get("prompt_version"),
+                ))
+            for tag_name in set(a.get("tags") or []):
+                article_tags.append(dict(article_id=article_id, tag_id=tag_ids[tag_name], is_auto=True))
+
+        by_article = lambda r: url_by_id[r["article_id"]]
+        summaries_failed, tags_failed = [], []
+        _bulk_insert(session, pg_insert(ArticleSummary), summaries, by_article, summaries_failed)
+        _bulk_insert(session, pg_insert(ArticleTag).on_conflict_do_nothing(), article_tags,
+                     by_article, tags_failed)
+        # The article row is in; put back the pending flags _article_row cleared
+        for failures, flag in ((summaries_failed, Article.needs_summary), (tags_failed, Article.needs_tags)):
+            if not failures: continue
+            ids = {article_ids[url] for url, _ in failures}
+            session.query(Article).filter(Article.id.in_(ids)).update({flag: True}, synchronize_session=False)
+        result["partial"] = summaries_failed + tags_failed
 
         session.commit()
-        log.info(f"Saved: {article_dict['title'][:60]}")
-        return True
+        log.info(f"Saved batch: {result['saved']} new ({len(result['partial'])} missing summary/tags), "
+                 f"{result['duplicates']} duplicates, {len(result['failed'])} failed")
+        return result
 
     except Exception as e:
         session.rollback()
-        log.error(f"Failed to save {article_dict.get('url')}: {e}")
-        return False
+        log.error(f"Failed to save batch of {len(batch)} articles: {e}")
+        return {"saved": 0, "duplicates": 0, "failed": [(a.get("url"), str(e)) for a in batch], "partial": []}
     finally:
         if owns_session:
             session.close()
 
+def save_article(article_dict: dict, source_name: str, source_url: str, db=None) -> bool:
+    """Save a single processed article + summary + tags. Returns True on success."""
+    return not save_articles([article_dict], source_name, source_url, db)["failed"]
+
 def update_source_health(source_name: str, success: bool, db=None):
     """Update source last_success/last_failure timestamp."""
     owns_session = db is None
@@ -7,7 +7,7 @@ from newsfeed.web.components.styles import (
     INPUT, INPUT_WIDE,
     TEXT_MUTED, TEXT_MUTED_XS, TEXT_LABEL, TEXT_HEADING, TEXT_ITALIC,
     TEXT_COL_HEADER, TEXT_TOTAL, TEXT_EDIT, TEXT_CANCEL, TEXT_DELETE, TEXT_COST,
-    BADGE_RUNNING, BADGE_SUCCESS, BADGE_FAILED, BADGE_IDLE,
+    BADGE_QUEUED, BADGE_RUNNING, BADGE_SUCCESS, BADGE_FAILED, BADGE_IDLE,
     ROW_BORDER, HEADER_ROW, TOTAL_ROW, TOGGLE_ACTIVE, TOGGLE_INACTIVE,
     GAP_2, GAP_2_MB, GAP_3, GAP_4, SECTION_MT, ICON_SM,
 )
@@ -370,6 +370,8 @@ def costs_table(rows, totals, active_period='all'):
 
 def job_status_badge(status):
     """Render job status badge."""
+    if status == 'queued':
+        return Span("🕒 Queued", cls=BADGE_QUEUED)
     if status == 'running':
         return Span("⏳ Running", cls=BADGE_RUNNING)
     if status == 'done':
@@ -418,7 +420,7 @@ def job_row(job, status, last_run, last_result):
         id=f"job-{job['key']}",
         cls=ROW_BORDER
     )
-    if is_running:
+    if is_running or status == 'queued':
         row = Div(row,
                   hx_get="/admin/tab/jobs",
                   hx_trigger="every 3s",
@@ -9,6 +9,7 @@ from newsfeed.web.components.styles import (
     FLEX_WRAP, FLEX_WRAP_ITEMS, FLEX_CENTER, FLEX_COL_GAP, FLEX_1,
     GAP_3_START, PANEL_MUTED, ICON_EDIT, ICON_STAR,
 )
+from newsfeed.web.queries.articles import HEADLINE_START, HEADLINE_STOP
 import re as re_module
 
 
@@ -107,6 +108,13 @@ def highlight(text, term):
     return Span(*[Mark(p) if p.lower() == term.lower() else p for p in parts])
 
 
+def headline_snippet(text):
+    """Render a search_articles headline, marking the matched words."""
+    if not text: return None
+    parts = re_module.split(f'{HEADLINE_START}(.*?){HEADLINE_STOP}', text)
+    return P(*[Mark(p) if i % 2 else p for i, p in enumerate(parts) if p], cls=TEXT_MUTED_XS)
+
+
 def summary_section(summary, search=''):
     """Render subtitle and bullets from summary."""
     if not summary: return P("No summary available", cls=TEXT_ITALIC)
@@ -133,6 +141,7 @@ def article_card(article, tags, starred, search=''):
                     hx_swap="outerHTML",
                     onclick="collapseExpanded(this)"),
                 card_meta(article, source_name, tags),
+                headline_snippet(article.search_headline) if search else None,
                 cls=FLEX_1
             ),
             cls=GAP_3_START
@@ -167,11 +176,11 @@ def expanded_card(article, tags, starred, summary, search=''):
     )
 
 
-def load_more_sentinel(state, offset, page_size):
-    """Hidden div that triggers next page load when scrolled into view."""
+def load_more_sentinel(state, cursor, page_size):
+    """Hidden div that triggers next page load (after `cursor`) when scrolled into view."""
     from urllib.parse import urlencode
     params = state.to_params()
-    params['offset'] = str(offset)
+    params['cursor'] = cursor
     params['page_size'] = str(page_size)
     cleaned = {k: v for k, v in params.items() if v}
     url = f"{state.base}/more?{urlencode(cleaned)}"
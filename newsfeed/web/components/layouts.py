@@ -8,6 +8,7 @@ from newsfeed.web.components.styles import (
     ROW_BORDER, ROW_HOVER, ROW_EXPANDED,
     GAP_2, GAP_2_WRAP, GAP_2_MB, GAP_3, SECTION_MT, ICON_SM, ICON_BASE,
 )
+from newsfeed.web.components.article import headline_snippet
 
 # ── Category Components ─────────────────────────────────────
 
@@ -209,6 +210,7 @@ def exec_search_results(articles, search, article_tags_fn, min_for_summary=5):
         Strong(a.title, cls="text-sm text-foreground"),
         Span(f" — {a.source.name}", cls=TEXT_MUTED_XS),
         Span(f" • {a.date}", cls=TEXT_MUTED_XS),
+        headline_snippet(a.search_headline),
         cls="py-1"
     ) for a in articles]
     parts.extend(cards)
@@ -77,6 +77,7 @@ TEXT_CANCEL = "text-xs text-muted-foreground cursor-pointer hover:text-foregroun
 TEXT_DELETE = "text-xs text-destructive cursor-pointer hover:underline"
 
 # ── Status Badges ───────────────────────────────────────────
+BADGE_QUEUED = f"{PILL} bg-blue-100 text-blue-700"
 BADGE_RUNNING = f"{PILL} bg-yellow-100 text-yellow-700"
 BADGE_SUCCESS = f"{PILL} bg-green-100 text-green-700"
 BADGE_FAILED = f"{PILL} bg-red-100 text-red-700"
@@ -13,6 +13,7 @@ JOBS = [
          {'name': 'from_date', 'label': 'From Date', 'placeholder': 'YYYY-MM-DD'},
          {'name': 'to_date', 'label': 'To Date', 'placeholder': 'YYYY-MM-DD'},
          {'name': 'max_pages', 'label': 'Max Pages', 'placeholder': '5'},
+         {'name': 'parallel_sites', 'label': 'Parallel Sites', 'placeholder': '1'},
      ]},
     {'key': 'category_summarizer', 'name': 'Category Summarizer', 'desc': 'Generate category summaries',
      'endpoint': '/run-category-summaries'},
@@ -87,6 +88,11 @@ def set_job_running(db, job_key):
     upsert_setting(db, f'job_{job_key}_status', 'running')
 
 
+def set_job_queued(db, job_key):
+    """Mark a job as waiting for a worker."""
+    upsert_setting(db, f'job_{job_key}_status', 'queued')
+
+
 def set_job_complete(db, job_key, success=True, error=''):
     """Mark a job as done or failed."""
     upsert_setting(db, f'job_{job_key}_status', 'done' if success else 'failed')
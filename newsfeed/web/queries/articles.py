@@ -1,20 +1,71 @@
 """Article queries — fetch, search, stars."""
 
-from sqlalchemy import desc, or_, cast, String
+from datetime import date
+from sqlalchemy import desc, or_, literal, literal_column, tuple_, exists, Float
 from sqlalchemy import func as sqla_func
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, load_only, with_expression
 from newsfeed.storage.models import (
     Article, ArticleTag, ArticleStar, ArticleSummary, Tag, Source
 )
 
+# ── Card Projection ─────────────────────────────────────────
+# Lists render cards only: load the card columns, source and tags, and the
+# viewer's star as a correlated EXISTS rather than every user's stars.
 
-def get_articles(db, limit=20, offset=0, tags=None, source=None, date_from=None, date_to=None):
-    """Fetch articles, optionally filtered by tags and source."""
+CARD_FIELDS = (Article.id, Article.title, Article.date, Article.url, Article.source_id)
+
+
+def starred_by(user_id):
+    """Correlated EXISTS: has `user_id` starred the outer article?"""
+    return exists().where(ArticleStar.article_id == Article.id, ArticleStar.user_id == user_id)
+
+
+def card_options(user_id=None):
+    """Query options for a lean article card row (star state only when `user_id` is given)."""
+    options = [load_only(*CARD_FIELDS),
+               joinedload(Article.source),
+               joinedload(Article.tags).joinedload(ArticleTag.tag)]
+    if user_id is not None:
+        options.append(with_expression(Article.starred, starred_by(user_id)))
+    return options
+
+# ── Keyset Pagination ───────────────────────────────────────
+# Feeds are ordered by (date, id) descending, undated articles last. Pages
+# continue from an opaque cursor holding the last row's key, so page N costs
+# the same as page 1 (idx_articles_feed_order) and rows never skip or repeat.
+
+NO_DATE = date.min
+FEED_DATE = sqla_func.coalesce(Article.date, literal_column("DATE '0001-01-01'"))
+
+
+def next_cursor(article):
+    """Cursor for the page after `article` (the last row of the current page)."""
+    key = f"{(article.date or NO_DATE).isoformat()}_{article.id}"
+    return f"{article.search_rank!r}_{key}" if article.search_rank is not None else key
+
+
+def _decode_cursor(cursor, ranked=False):
+    """Split a cursor into its typed key parts; raises ValueError if malformed or of the wrong kind."""
+    parts = cursor.split("_")
+    if len(parts) != (3 if ranked else 2):
+        raise ValueError(f"Invalid {'search' if ranked else 'feed'} cursor: {cursor!r}")
+    *rank, day, article_id = parts
+    key = (date.fromisoformat(day), int(article_id))
+    return (float(rank[0]), *key) if rank else key
+
+
+def _keyset_page(q, cursor, limit):
+    """Order a feed query by (date, id) and apply the cursor."""
+    if cursor:
+        q = q.filter(tuple_(FEED_DATE, Article.id) < tuple_(*_decode_cursor(cursor)))
+    return q.order_by(desc(FEED_DATE), desc(Article.id)).limit(limit).all()
+
+
+def get_articles(db, limit=20, cursor=None, tags=None, source=None, date_from=None, date_to=None,
+                 user_id=None):
+    """Fetch a page of articles, optionally filtered by tags and source."""
     q = (db.query(Article)
-         .options(joinedload(Article.source),
-                  joinedload(Article.tags).joinedload(ArticleTag.tag),
-                  joinedload(Article.stars))
-         .order_by(desc(Article.date)))
+         .options(*card_options(user_id)))
     if tags:
         q = (q.join(ArticleTag).join(Tag)
              .filter(Tag.name.in_(tags), ArticleTag.removed == False)
@@ -26,17 +77,15 @@ def get_articles(db, limit=20, offset=0, tags=None, source=None, date_from=None,
         q = q.filter(Article.date >= date_from)
     if date_to:
         q = q.filter(Article.date <= date_to)
-    return q.limit(limit).offset(offset).all()
+    return _keyset_page(q, cursor, limit)
 
 
-def get_starred_articles(db, limit=20, offset=0, tags=None, source=None, date_from=None, date_to=None):
-    """Fetch articles that have at least one star."""
+def get_starred_articles(db, limit=20, cursor=None, tags=None, source=None, date_from=None, date_to=None,
+                         user_id=None):
+    """Fetch a page of articles that have at least one star."""
     q = (db.query(Article)
          .join(ArticleStar)
-         .options(joinedload(Article.source),
-                  joinedload(Article.tags).joinedload(ArticleTag.tag),
-                  joinedload(Article.stars))
-         .order_by(desc(Article.date)))
+         .options(*card_options(user_id)))
     if tags:
         q = (q.join(ArticleTag).join(Tag)
              .filter(Tag.name.in_(tags), ArticleTag.removed == False)
@@ -48,15 +97,13 @@ def get_starred_articles(db, limit=20, offset=0, tags=None, source=None, date_fr
         q = q.filter(Article.date >= date_from)
     if date_to:
         q = q.filter(Article.date <= date_to)
-    return q.limit(limit).offset(offset).all()
+    return _keyset_page(q, cursor, limit)
 
 
-def get_article(db, article_id):
-    """Fetch single article with relations."""
+def get_article(db, article_id, user_id=None):
+    """Fetch a single article card with relations."""
     return (db.query(Article)
-            .options(joinedload(Article.source),
-                     joinedload(Article.tags).joinedload(ArticleTag.tag),
-                     joinedload(Article.stars))
+            .options(*card_options(user_id))
             .filter(Article.id == article_id)
             .first())
 
@@ -75,7 +122,8 @@ def article_tags(article):
 
 
 def is_starred(article, user_id):
-    """Check if user has starred this article."""
+    """Check if user has starred this article (uses the query's EXISTS when loaded)."""
+    if article.starred is not None: return article.starred
     return any(s.user_id == user_id for s in article.stars)
 
 
@@ -94,18 +142,39 @@ def toggle_star(db, article_id, user_id):
     return True
 
 
-def search_articles(db, query, limit=20, offset=0):
-    """Search articles by title, subtitle, and bullets using ILIKE."""
-    term = f"%{query}%"
-    return (db.query(Article)
-            .outerjoin(ArticleSummary)
-            .options(joinedload(Article.source),
-                     joinedload(Article.tags).joinedload(ArticleTag.tag),
-                     joinedload(Article.stars))
-            .filter(or_(
-                Article.title.ilike(term),
-                ArticleSummary.subtitle.ilike(term),
-                cast(ArticleSummary.bullets, String).ilike(term)))
-            .order_by(desc(Article.date))
-            .limit(limit).offset(offset)
+# ── Search ──────────────────────────────────────────────────
+# Matches in search_headline are wrapped in these control characters; the
+# card component turns them into <mark> spans after escaping the text.
+HEADLINE_START, HEADLINE_STOP = "\x02", "\x03"
+HEADLINE_OPTIONS = f"StartSel={HEADLINE_START}, StopSel={HEADLINE_STOP}, MaxWords=30, MinWords=10"
+
+
+def search_articles(db, query, limit=20, cursor=None, user_id=None):
+    """Full-text search over title, latest summary, and content, ranked by relevance.
+
+    Uses the GIN-indexed search_vector (websearch syntax: quotes, OR, -term), plus
+    trigram word similarity on the title so partial words and typos still match.
+    Each result carries a highlighted snippet in `search_headline`; pages are keyed
+    on (rank, date, id).
+    """
+    tsq = sqla_func.websearch_to_tsquery("english", query)
+    term = literal(query)
+    # float8 so the rank round-trips exactly through the cursor
+    rank = (sqla_func.ts_rank(Article.search_vector, tsq)
+            + sqla_func.word_similarity(term, Article.title)).cast(Float)
+    headline = sqla_func.ts_headline(
+        "english", sqla_func.coalesce(sqla_func.article_summary_text(Article.id), Article.title),
+        tsq, HEADLINE_OPTIONS)
+    q = (db.query(Article)
+         .options(*card_options(user_id),
+                  with_expression(Article.search_headline, headline),
+                  with_expression(Article.search_rank, rank))
+         .filter(or_(
+             Article.search_vector.op("@@")(tsq),
+             Article.title.ilike(f"%{query}%"),
+             term.op("<%")(Article.title))))
+    if cursor:
+        q = q.filter(tuple_(rank, FEED_DATE, Article.id) < tuple_(*_decode_cursor(cursor, ranked=True)))
+    return (q.order_by(desc(rank), desc(FEED_DATE), desc(Article.id))
+            .limit(limit)
             .all())
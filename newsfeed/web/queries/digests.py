@@ -3,12 +3,15 @@
 from datetime import datetime
 from sqlalchemy import desc
 from sqlalchemy import func as sqla_func
-from sqlalchemy.orm import joinedload
 from newsfeed.storage.models import (
     Article, ArticleTag, ArticleStar, Tag,
     CategorySummary, Digest, DigestItem, DigestSummary,
     KeywordSummary
 )
+from newsfeed.web.queries.articles import card_options
+
+# NOTIFY channel the keyword summarizer LISTENs on; payload is the summary id
+KEYWORD_SUMMARY_CHANNEL = 'keyword_summaries'
 
 
 def get_category_summaries(db, tag_names, date_from, date_to):
@@ -66,8 +69,7 @@ def get_newsletter_articles(db, digest_id):
     """Fetch articles in a newsletter, ordered by sort_order."""
     return (db.query(Article)
             .join(DigestItem, Article.id == DigestItem.article_id)
-            .options(joinedload(Article.source),
-                     joinedload(Article.tags).joinedload(ArticleTag.tag))
+            .options(*card_options())
             .filter(DigestItem.digest_id == digest_id)
             .order_by(DigestItem.sort_order)
             .all())
@@ -127,7 +129,7 @@ def create_newsletter_summary_version(db, digest_id, content, user_id=None):
 
 
 def create_keyword_summary(db, query, article_count, user_id=None):
-    """Create a pending keyword summary request."""
+    """Create a pending keyword summary request and notify the summarizer."""
     ks = KeywordSummary(
         query=query,
         article_count=article_count,
@@ -135,6 +137,9 @@ def create_keyword_summary(db, query, article_count, user_id=None):
         requested_by=user_id
     )
     db.add(ks)
+    db.flush()
+    # Delivered on commit, so the summarizer never sees an id before the row exists
+    db.execute(sqla_func.pg_notify(KEYWORD_SUMMARY_CHANNEL, str(ks.id)).select())
     db.commit()
     return ks
 
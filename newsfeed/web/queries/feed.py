@@ -12,7 +12,7 @@ All query functions have been split into focused modules:
 # Articles
 from newsfeed.web.queries.articles import (
     get_articles, get_starred_articles, get_article, get_latest_summary,
-    article_tags, is_starred, toggle_star, search_articles
+    article_tags, is_starred, toggle_star, search_articles, next_cursor
 )
 
 # Tags
@@ -79,6 +79,7 @@ def add_tag_to_article(db, article_id, tag_name, user_id=None):
             is_auto=False, added_by=user_id
         ))
 
+    db.query(Article).filter(Article.id == article_id).update({Article.needs_tags: False})
     db.add(TagEdit(article_id=article_id, tag_id=tag.id, action='add', user_id=user_id))
     db.commit()
 
@@ -14,7 +14,7 @@ from newsfeed.web.queries.feed import (
     create_user, update_user_role, delete_user,
     get_all_sources, toggle_source_active,
     get_cost_by_source, get_cost_totals,
-    JOBS, get_job_status, set_job_running
+    JOBS, get_job_status
 )
 from newsfeed.web.filters import date_range
 
@@ -48,11 +48,13 @@ def admin_content(db, tab='settings', trigger_endpoint=None, **kwargs):
     """Ribbon + tab content — HTMX target."""
     content = Div(admin_ribbon(tab), tab_content(db, tab, **kwargs), id="admin-content")
     if trigger_endpoint:
-        # Fire off the job endpoint via HTMX after rendering
+        # Fire off the job endpoint via HTMX after rendering, then reload the tab to show it queued
         content = Div(
             admin_ribbon(tab),
             tab_content(db, tab, **kwargs),
-            Div(hx_get=trigger_endpoint, hx_trigger="load", hx_swap="none"),
+            Div(hx_get=trigger_endpoint, hx_trigger="load", hx_swap="none",
+                **{"hx-on::after-request": f"htmx.ajax('GET', '/admin/tab/{tab}', "
+                                           "{target: '#admin-content', swap: 'outerHTML'})"}),
             id="admin-content"
         )
     return content
@@ -141,14 +143,15 @@ def post(source_id: int, session, request):
     return admin_content(db, 'sources')
 
 @ar('/admin/jobs/{job_key}/run')
-def post(job_key: str, session, request, from_date: str = '', to_date: str = '', max_pages: str = ''):
+def post(job_key: str, session, request, from_date: str = '', to_date: str = '', max_pages: str = '',
+         parallel_sites: str = ''):
     db = request.state.db
     job = next((j for j in JOBS if j['key'] == job_key), None)
     if not job: return admin_content(db, 'jobs')
-    set_job_running(db, job_key)
     # Build the endpoint URL with any params
     endpoint = job['endpoint']
-    params = {k: v for k, v in {'from_date': from_date, 'to_date': to_date, 'max_pages': max_pages}.items() if v.strip()}
+    params = {k: v for k, v in {'from_date': from_date, 'to_date': to_date, 'max_pages': max_pages,
+                                'parallel_sites': parallel_sites}.items() if v.strip()}
     if params:
         from urllib.parse import urlencode
         endpoint = f"{endpoint}?{urlencode(params)}"
@@ -52,7 +52,7 @@ def starred_list(db, user_id, state):
     """Build starred article card list."""
     d_from, d_to = date_range(state.date)
     articles = get_starred_articles(db, tags=state.tags, source=state.source,
-                                     date_from=d_from, date_to=d_to)
+                                     date_from=d_from, date_to=d_to, user_id=user_id)
     cards = [article_card(a, article_tags(a), is_starred(a, user_id))
              for a in articles]
     if not cards: return P("No starred articles", cls=TEXT_EMPTY)
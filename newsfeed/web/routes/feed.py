@@ -10,7 +10,7 @@ from newsfeed.web.queries.feed import (
     get_articles, get_article, get_latest_summary,
     article_tags, is_starred, toggle_star,
     get_tags_with_counts, get_sources_with_counts, get_setting, search_articles,
-    get_all_tags, add_tag_to_article, remove_tag_from_article
+    next_cursor, get_all_tags, add_tag_to_article, remove_tag_from_article
 )
 from newsfeed.web.filters import FilterState, date_range
 from newsfeed.storage.models import Article
@@ -37,15 +37,16 @@ def article_list(db, user_id, state):
     """Build article card list."""
     page_size = int(get_setting(db, 'page_size', '20'))
     if state.search:
-        articles = search_articles(db, state.search, limit=page_size)
+        articles = search_articles(db, state.search, limit=page_size, user_id=user_id)
     else:
         d_from, d_to = date_range(state.date)
         articles = get_articles(db, limit=page_size, tags=state.tags,
-                                source=state.source, date_from=d_from, date_to=d_to)
+                                source=state.source, date_from=d_from, date_to=d_to,
+                                user_id=user_id)
     cards = [article_card(a, article_tags(a), is_starred(a, user_id), state.search)
              for a in articles]
     if len(articles) == page_size:
-        cards.append(load_more_sentinel(state, page_size, page_size))
+        cards.append(load_more_sentinel(state, next_cursor(articles[-1]), page_size))
     return Div(*cards, id="article-list")
 
 def feed_filters(db, state):
@@ -89,16 +90,16 @@ def get(session, request, tags: str = '', expanded: str = '0', source: str = '',
 @ar('/feed/article/{article_id}/expand')
 def get(article_id: int, session, request, search: str = ''):
     db = request.state.db
-    article = get_article(db, article_id)
-    summary = get_latest_summary(db, article_id)
     user_id = session.get('user_id')
+    article = get_article(db, article_id, user_id)
+    summary = get_latest_summary(db, article_id)
     return expanded_card(article, article_tags(article), is_starred(article, user_id), summary, search)
 
 @ar('/feed/article/{article_id}/collapse')
 def get(article_id: int, session, request):
     db = request.state.db
-    article = get_article(db, article_id)
     user_id = session.get('user_id')
+    article = get_article(db, article_id, user_id)
     return article_card(article, article_tags(article), is_starred(article, user_id))
 
 
@@ -111,21 +112,25 @@ def post(article_id: int, session, request):
 
 @ar('/feed/more')
 def get(session, request, tags: str = '', source: str = '', date: str = '',
-        search: str = '', offset: int = 0, page_size: int = 20):
+        search: str = '', cursor: str = '', page_size: int = 20):
     db = request.state.db
     state = FilterState.from_request(tags, source, date, search)
     user_id = session.get('user_id')
-    if state.search:
-        articles = search_articles(db, state.search, limit=page_size, offset=offset)
-    else:
-        d_from, d_to = date_range(state.date)
-        articles = get_articles(db, limit=page_size, offset=offset,
-                                tags=state.tags, source=state.source,
-                                date_from=d_from, date_to=d_to)
+    try:
+        if state.search:
+            articles = search_articles(db, state.search, limit=page_size, cursor=cursor,
+                                       user_id=user_id)
+        else:
+            d_from, d_to = date_range(state.date)
+            articles = get_articles(db, limit=page_size, cursor=cursor,
+                                    tags=state.tags, source=state.source,
+                                    date_from=d_from, date_to=d_to, user_id=user_id)
+    except ValueError:
+        return Response('Invalid cursor', status_code=400)
     cards = [article_card(a, article_tags(a), is_starred(a, user_id), state.search)
              for a in articles]
     if len(articles) == page_size:
-        cards.append(load_more_sentinel(state, offset + page_size, page_size))
+        cards.append(load_more_sentinel(state, next_cursor(articles[-1]), page_size))
     return Div(*cards)
 
 @ar('/feed/article/{article_id}/tags/edit')
@@ -1,69 +1,46 @@
-"""Job endpoints — triggered by Cloud Scheduler or admin UI."""
+"""Job endpoints — triggered by Cloud Scheduler or admin UI.
+
+Each endpoint only queues its job and returns 202 with the job id; a
+`python -m newsfeed.worker` process runs it (see newsfeed/jobs.py).
+"""
 from fasthtml.common import *
-from newsfeed.web.scripts.keyword_summarizer import run_once
-from newsfeed.web.queries.admin import set_job_complete
-import logging
+from newsfeed.jobs import enqueue
+from newsfeed.storage.models import Job
 
 ar = APIRouter()
 
-@ar.get('/process-pending-keywords')
-def process_pending_keywords(request):
-    db = request.state.db
+def queue_job(request, kind, **params):
     try:
-        count = run_once(db)
-        set_job_complete(db, 'keyword_summarizer', success=True)
-        return JSONResponse({'processed': count})
+        job_id = enqueue(request.state.db, kind, **params)
+        return JSONResponse({'status': 'queued', 'job_id': job_id}, status_code=202)
     except Exception as e:
-        set_job_complete(db, 'keyword_summarizer', success=False, error=str(e))
         return JSONResponse({'status': 'error', 'message': str(e)}, status_code=500)
 
+@ar.get('/process-pending-keywords')
+def process_pending_keywords(request):
+    return queue_job(request, 'keyword_summarizer')
+
 @ar.get('/run-pipeline')
-def run_pipeline(request):
-    db = request.state.db
-    try:
-        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
-        from newsfeed.config import load_all_site_configs
-        from newsfeed.pipeline import run
-        for site_name in load_all_site_configs():
-            run(site_name)
-        set_job_complete(db, 'pipeline', success=True)
-        return JSONResponse({'status': 'success'})
-    except Exception as e:
-        set_job_complete(db, 'pipeline', success=False, error=str(e))
-        return JSONResponse({'status': 'error', 'message': str(e)}, status_code=500)
+def run_pipeline(request, from_date: str = '', to_date: str = '', max_pages: int = 5, parallel_sites: int = 1):
+    return queue_job(request, 'pipeline', from_date=from_date or None, to_date=to_date or None,
+                     max_pages=max_pages, parallel_sites=parallel_sites)
 
 @ar.get('/run-category-summaries')
 def run_category_summaries(request):
-    db = request.state.db
-    try:
-        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
-        from newsfeed.scripts.category_summaries import run
-        run()
-        set_job_complete(db, 'category_summarizer', success=True)
-        return JSONResponse({'status': 'success'})
-    except Exception as e:
-        set_job_complete(db, 'category_summarizer', success=False, error=str(e))
-        return JSONResponse({'status': 'error', 'message': str(e)}, status_code=500)
+    return queue_job(request, 'category_summarizer')
 
 @ar.get('/run-newsletter')
-def run_newsletter(request):
-    db = request.state.db
-    try:
-        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
-        from newsfeed.scripts.create_newsletter import run
-        run()
-        set_job_complete(db, 'newsletter_creator', success=True)
-        return JSONResponse({'status': 'success'})
-    except Exception as e:
-        set_job_complete(db, 'newsletter_creator', success=False, error=str(e))
-        return JSONResponse({'status': 'error', 'message': str(e)}, status_code=500)
+def run_newsletter(request, from_date: str = '', to_date: str = ''):
+    return queue_job(request, 'newsletter_creator', from_date=from_date or None, to_date=to_date or None)
 
 @ar.get('/backfill')
-def backfill(request):
-    try:
-        logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
-        from newsfeed.backfill import run_backfill
-        result = run_backfill()
-        return JSONResponse({'status': 'success', **result})
-    except Exception as e:
-        return JSONResponse({'status': 'error', 'message': str(e)}, status_code=500)
+def backfill(request, limit: int = 0, since: str = '', concurrency: int = 4):
+    return queue_job(request, 'backfill', limit=limit or None, since=since or None, concurrency=concurrency)
+
+@ar.get('/jobs/{job_id}')
+def job_status(request, job_id: int):
+    job = request.state.db.get(Job, job_id)
+    if not job: return JSONResponse({'status': 'error', 'message': 'Job not found'}, status_code=404)
+    return JSONResponse({'job_id': job.id, 'kind': job.kind, 'status': job.status, 'attempts': job.attempts,
+                         'result': job.result, 'error': job.error,
+                         'finished_at': job.finished_at.isoformat() if job.finished_at else None})
@@ -1,17 +1,28 @@
-"""Background worker — processes pending keyword summaries via Gemini."""
-import os, time, logging
+"""Background worker — processes pending keyword summaries via Gemini.
+
+New requests arrive by Postgres NOTIFY (see create_keyword_summary), so the
+loop blocks on LISTEN instead of polling; a slow fallback poll catches anything
+missed while disconnected. Requests run concurrently on a bounded pool, each
+holding its row lock (FOR UPDATE SKIP LOCKED), so several summarizers or a
+queued /process-pending-keywords job never work on the same request.
+"""
+import time, select, logging, contextvars
 import newsfeed.env  # noqa: F401 — load .env once
-from google import genai
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from newsfeed.storage.database import get_session
+from newsfeed.storage.database import get_session, get_engine
 from newsfeed.storage.models import KeywordSummary, Article, ArticleSummary
 from sqlalchemy import desc, cast, String
 from newsfeed.web.queries.feed import search_articles
+from newsfeed.web.queries.digests import KEYWORD_SUMMARY_CHANNEL
 from newsfeed.config import DEFAULT_MODEL
-from newsfeed.cost import track_usage
+from newsfeed import llm
 
 log = logging.getLogger("newsfeed.keyword_summarizer")
 
+DEFAULT_CONCURRENCY = 4
+FALLBACK_POLL = 60  # seconds between sweeps for pending rows when no NOTIFY arrives
+
 PROMPT_TEMPLATE = """You are a market intelligence analyst.
 Summarize the following {count} articles matching the search query "{query}".
 Provide a concise 3-5 sentence summary highlighting key themes, trends, and implications.
@@ -20,26 +31,11 @@ Articles:
 {articles_text}
 """
 
-# ── Gemini Client ───────────────────────────────────────────
-
-_client = None
-
-def _get_client():
-    global _client
-    if _client is None:
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY not set in environment")
-        _client = genai.Client(api_key=api_key)
-    return _client
-
-
-def get_pending_summaries(db):
-    """Fetch all pending keyword summary requests."""
-    return (db.query(KeywordSummary)
-            .filter(KeywordSummary.status == 'pending')
-            .order_by(KeywordSummary.created_at)
-            .all())
+def get_pending_ids(db):
+    """Ids of pending keyword summary requests, oldest first."""
+    return [r.id for r in (db.query(KeywordSummary.id)
+                           .filter(KeywordSummary.status == 'pending')
+                           .order_by(KeywordSummary.created_at))]
 
 def format_articles(articles):
     """Format articles for the LLM prompt."""
@@ -53,18 +49,12 @@ def format_articles(articles):
 def generate_summary(query, articles, model=None):
     """Call Gemini to generate the summary."""
     if model is None: model = DEFAULT_MODEL
-    client = _get_client()
     prompt = PROMPT_TEMPLATE.format(
         count=len(articles),
         query=query,
         articles_text=format_articles(articles)
     )
-    response = client.models.generate_content(model=model, contents=prompt)
-    usage = response.usage_metadata
-    input_tok = getattr(usage, 'prompt_token_count', None) or 0
-    output_tok = getattr(usage, 'candidates_token_count', None) or 0
-    track_usage(input_tok, output_tok, model)
-    return response.text
+    return llm.generate(prompt, model=model).text
 
 
 def process_one(db, ks):
@@ -91,42 +81,126 @@ def process_one(db, ks):
         log.error(f"Failed summary {ks.id}: {e}")
 
 
-def run_once(db):
-    """Process all pending summaries."""
-    pending = get_pending_summaries(db)
-    for ks in pending:
-        process_one(db, ks)
+def process_id(summary_id):
+    """Lock and process one pending request in its own session; False if it was taken or already done."""
+    db = get_session()
+    try:
+        ks = (db.query(KeywordSummary)
+              .filter(KeywordSummary.id == summary_id, KeywordSummary.status == 'pending')
+              .with_for_update(skip_locked=True)
+              .first())
+        if ks is None: return False
+        process_one(db, ks)  # commits, releasing the lock
+        return True
+    finally:
+        db.close()
+
+
+class Dispatcher:
+    """Submits summary ids to a bounded pool, ignoring ids already in flight."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY):
+        self.pool = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="keyword")
+        self.in_flight = set()
+
+    def submit(self, ids):
+        for summary_id in ids:
+            if summary_id in self.in_flight: continue
+            self.in_flight.add(summary_id)
+            future = self.pool.submit(contextvars.copy_context().run, process_id, summary_id)
+            future.add_done_callback(lambda f, i=summary_id: self._done(i, f))
+
+    def _done(self, summary_id, future):
+        self.in_flight.discard(summary_id)
+        if future.exception(): log.error(f"Summary {summary_id} crashed: {future.exception()}")
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+
+
+def run_once(db, concurrency=DEFAULT_CONCURRENCY):
+    """Process all pending summaries, up to `concurrency` at once; returns how many were pending."""
+    pending = get_pending_ids(db)
+    db.commit()  # end the read transaction before workers lock rows
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="keyword") as pool:
+        list(pool.map(process_id, pending))
     return len(pending)
 
 
-def run_loop(poll_interval=5):
-    """Continuously poll for and process pending summaries."""
-    log.info(f"Starting keyword summarizer (poll every {poll_interval}s)")
-    while True:
-        db = get_session()
-        try:
-            count = run_once(db)
-            if count: log.info(f"Processed {count} summaries")
-        finally:
-            db.close()
-        time.sleep(poll_interval)
+def listen_connection():
+    """A raw autocommit connection LISTENing on the keyword summary channel (detached from the pool)."""
+    raw = get_engine().raw_connection()
+    conn = raw.driver_connection
+    raw.detach()  # never hand a LISTENing autocommit connection back to the pool
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute(f"LISTEN {KEYWORD_SUMMARY_CHANNEL}")
+    return conn
+
+
+def wait_for_ids(conn, timeout):
+    """Block up to `timeout` seconds for notifications; returns the ids they carry."""
+    if not select.select([conn], [], [], timeout)[0]: return []
+    conn.poll()
+    ids = [int(n.payload) for n in conn.notifies if n.payload.isdigit()]
+    conn.notifies.clear()
+    return ids
+
+
+def sweep(dispatcher):
+    """Fallback poll: dispatch every pending request."""
+    db = get_session()
+    try:
+        dispatcher.submit(get_pending_ids(db))
+    finally:
+        db.close()
+
+
+def run_loop(poll_interval=FALLBACK_POLL, concurrency=DEFAULT_CONCURRENCY):
+    """Process requests as they are NOTIFYed, sweeping for missed ones every `poll_interval` seconds."""
+    log.info(f"Starting keyword summarizer (LISTEN {KEYWORD_SUMMARY_CHANNEL}, "
+             f"fallback poll every {poll_interval}s, {concurrency} at a time)")
+    dispatcher = Dispatcher(concurrency)
+    conn = None
+    try:
+        while True:
+            try:
+                if conn is None:
+                    conn = listen_connection()
+                    sweep(dispatcher)  # anything requested while we weren't listening
+                    last_sweep = time.monotonic()
+                ids = wait_for_ids(conn, max(0, poll_interval - (time.monotonic() - last_sweep)))
+                if ids:
+                    dispatcher.submit(ids)
+                if time.monotonic() - last_sweep >= poll_interval:
+                    sweep(dispatcher)
+                    last_sweep = time.monotonic()
+            except Exception as e:
+                log.error(f"Listener error, reconnecting: {e}")
+                if conn is not None: conn.close()
+                conn = None
+                time.sleep(5)
+    finally:
+        if conn is not None: conn.close()
+        dispatcher.shutdown()
 
 if __name__ == "__main__":
     import argparse
     logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
     parser = argparse.ArgumentParser()
     parser.add_argument("--once", action="store_true", help="Process pending and exit")
-    parser.add_argument("--interval", type=int, default=5, help="Poll interval in seconds")
+    parser.add_argument("--interval", type=int, default=FALLBACK_POLL, help="Fallback poll interval in seconds")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Summaries generated at once")
     args = parser.parse_args()
 
     from newsfeed.web.queries.feed import set_job_complete
     try:
         if args.once:
             db = get_session()
-            run_once(db)
+            run_once(db, args.concurrency)
             db.close()
         else:
-            run_loop(args.interval)
+            run_loop(args.interval, args.concurrency)
         db = get_session()
         set_job_complete(db, 'keyword_summarizer', success=True)
         db.close()
@@ -0,0 +1,113 @@
+"""Job worker: runs jobs from the jobs table (see newsfeed/jobs.py).
+
+    python -m newsfeed.worker [--concurrency N] [--poll SECONDS] [--once]
+
+Start as many worker processes, on as many machines, as needed; they share the
+queue. SIGTERM/SIGINT stop claiming new jobs and let running ones finish.
+"""
+import argparse, contextvars, logging, os, signal, socket, threading
+import newsfeed.env  # noqa: F401 — load .env once
+
+from newsfeed import jobs
+from newsfeed.cost import reset_daily_usage
+from newsfeed.storage.database import get_session
+
+log = logging.getLogger("newsfeed.worker")
+
+def _run_handler(kind: str, params: dict):
+    """Run a job's handler with fresh cost counters (called inside the job's own context)."""
+    reset_daily_usage()
+    return jobs.HANDLERS[kind](**params)
+
+class Worker:
+    """Runs up to `concurrency` jobs at once, polling the queue every `poll` seconds when idle."""
+
+    def __init__(self, concurrency: int = 2, poll: float = 2.0):
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency, self.poll = concurrency, poll
+        self.stop = threading.Event()       # stop claiming new jobs
+        self._done = threading.Event()      # all job threads have exited
+        self._running: set[int] = set()
+        self._lock = threading.Lock()
+
+    def run_one(self) -> bool:
+        """Claim and run one job; False if nothing was runnable."""
+        db = get_session()
+        try:
+            job = jobs.claim(db, self.name)
+            if job is None: return False
+            job_id, kind, params = job.id, job.kind, dict(job.params or {})
+            with self._lock: self._running.add(job_id)
+            log.info(f"Job {job_id} ({kind}) started {params}")
+            try:
+                # A fresh context per job, so per-run state (cost counters, log site) never leaks between jobs
+                result = contextvars.Context().run(_run_handler, kind, params)
+            except Exception as e:
+                log.exception(f"Job {job_id} ({kind}) failed")
+                jobs.finish(db, job_id, error=str(e) or type(e).__name__)
+            else:
+                jobs.finish(db, job_id, result=result)
+                log.info(f"Job {job_id} ({kind}) done")
+            finally:
+                with self._lock: self._running.discard(job_id)
+            return True
+        finally:
+            db.close()
+
+    def _loop(self, once: bool):
+        while not self.stop.is_set():
+            try:
+                if self.run_one(): continue
+            except Exception as e:
+                log.error(f"Queue error: {e}")
+            if once: return
+            self.stop.wait(self.poll)
+
+    def _heartbeat(self):
+        while not self._done.wait(jobs.HEARTBEAT_INTERVAL):
+            db = get_session()
+            try:
+                with self._lock: running = list(self._running)
+                jobs.heartbeat(db, running)
+                jobs.requeue_stale(db)
+            except Exception as e:
+                log.error(f"Heartbeat failed: {e}")
+            finally:
+                db.close()
+
+    def run(self, once: bool = False):
+        """Work the queue until stopped (or, with `once`, until it is empty)."""
+        log.info(f"Worker {self.name} starting ({self.concurrency} concurrent jobs)")
+        db = get_session()
+        try:
+            jobs.requeue_stale(db)
+        finally:
+            db.close()
+        threading.Thread(target=self._heartbeat, name="heartbeat", daemon=True).start()
+        threads = [threading.Thread(target=self._loop, args=(once,), name=f"job-{i}")
+                   for i in range(self.concurrency)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        self._done.set()
+        log.info(f"Worker {self.name} stopped")
+
+def main():
+    from newsfeed.logcontext import LOG_FORMAT
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    parser = argparse.ArgumentParser(description="Run queued jobs")
+    parser.add_argument("--concurrency", type=int, default=2, help="Jobs to run at once")
+    parser.add_argument("--poll", type=float, default=2.0, help="Seconds between polls when idle")
+    parser.add_argument("--once", action="store_true", help="Drain the queue and exit")
+    args = parser.parse_args()
+
+    worker = Worker(max(1, args.concurrency), args.poll)
+    def shutdown(signum, frame):
+        log.info("Stopping — finishing running jobs")
+        worker.stop.set()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    worker.run(once=args.once)
+
+if __name__ == "__main__":
+    main()